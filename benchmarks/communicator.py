@@ -0,0 +1,213 @@
+"""
+Round-trip and throughput benchmark of the Communicator.
+
+Starts a ``showcase`` with the communicator under the `offscreen` Qt platform
+against a local static page and measures the round-trip latency percentiles
+and the commands per second of the payload paths (byte-string, marshalled
+function, pickled object, named command), also with several concurrent clients.
+The results are written as JSON.
+
+    python benchmarks/communicator.py --clients 1 4 16 --output bench.json
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+from argparse import ArgumentParser
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from pathlib import Path
+from statistics import mean, quantiles
+from time import perf_counter, sleep, monotonic
+
+_root = Path(__file__).parent.parent
+_src = _root / "src" / "showcase_browser"
+
+sys.path.append(str(_src))
+
+from client import Client, Call, format_address
+from payloads import Noop
+
+
+PAGE = b"""\
+<!DOCTYPE html>
+<html><head><title>showcase benchmark</title></head>
+<body><h1>showcase benchmark</h1></body></html>
+"""
+
+
+def _function(sc, res):
+    res["x"] = 1
+
+
+PAYLOADS = {
+    "bytes": lambda client: client.com(b"x = 1"),
+    "marshal": lambda client: client.com(_function),
+    "pickle": lambda client: client.com(Noop()),
+    "call": lambda client: client.com_call("ping"),
+}
+
+
+def serve_page(directory: str) -> ThreadingHTTPServer:
+    Path(directory, "index.html").write_bytes(PAGE)
+
+    class Handler(SimpleHTTPRequestHandler):
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=directory, **kwargs)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def start_showcase(url: str, address: tuple[str, int] | str, timeout: float = 60) -> subprocess.Popen:
+    env = os.environ | {
+        "QT_QPA_PLATFORM": "offscreen",
+        "PYTHONPATH": os.pathsep.join(filter(None, (str(Path(__file__).parent), os.environ.get("PYTHONPATH")))),
+    }
+    env.setdefault("QTWEBENGINE_DISABLE_SANDBOX", "1")
+    if isinstance(address, str):
+        com = ["--com-unix", address]
+    else:
+        com = ["--com-host", address[0], "--com-port", str(address[1])]
+    process = subprocess.Popen(
+        [sys.executable, str(_src / "main.py"), url, "--com", "--skip-upgrades", *com],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    client = Client(address, timeout=5)
+    t = monotonic() + timeout
+    while not client.com_ping():
+        if process.poll() is not None:
+            raise RuntimeError(f"the showcase exited with code {process.returncode}")
+        if monotonic() > t:
+            process.kill()
+            raise TimeoutError(f"no communicator at {format_address(address)} after {timeout} s")
+        sleep(.1)
+    if not client.com_call("wait_load", timeout=timeout).get("return"):
+        raise RuntimeError(f"could not load {url}")
+    return process
+
+
+def stats(latencies: list[float], duration: float) -> dict:
+    p = quantiles(latencies, n=100, method="inclusive")
+    return {
+        "requests": len(latencies),
+        "duration_s": duration,
+        "commands_per_s": len(latencies) / duration,
+        "latency_ms": {
+            "mean": mean(latencies) * 1000,
+            "min": min(latencies) * 1000,
+            "p50": p[49] * 1000,
+            "p90": p[89] * 1000,
+            "p99": p[98] * 1000,
+            "max": max(latencies) * 1000,
+        },
+    }
+
+
+def run_clients(address, payload: str, n_clients: int, requests: int, persistent: bool) -> dict:
+    command = PAYLOADS[payload]
+    per_client = [list() for _ in range(n_clients)]
+    barrier = threading.Barrier(n_clients + 1)
+    errors = list()
+
+    def work(latencies: list[float]):
+        with Client(address, persistent=persistent) as client:
+            command(client)  # connect and warm up the code caches
+            barrier.wait()
+            for _ in range(requests):
+                t = perf_counter()
+                res = command(client)
+                latencies.append(perf_counter() - t)
+                if "!" in res:
+                    errors.append(repr(res["!"]))
+
+    threads = [threading.Thread(target=work, args=(latencies,)) for latencies in per_client]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    t = perf_counter()
+    for thread in threads:
+        thread.join()
+    duration = perf_counter() - t
+    result = stats([x for latencies in per_client for x in latencies], duration)
+    result.update(payload=payload, clients=n_clients, persistent=persistent, errors=len(errors))
+    return result
+
+
+def run_batch(address, size: int, requests: int) -> dict:
+    latencies = list()
+    with Client(address, persistent=True) as client:
+        operations = [Call("ping")] * size
+        client.com_batch(operations)
+        t0 = perf_counter()
+        for _ in range(requests):
+            t = perf_counter()
+            client.com_batch(operations)
+            latencies.append(perf_counter() - t)
+        duration = perf_counter() - t0
+    result = stats(latencies, duration)
+    result.update(payload="batch", batch_size=size, operations_per_s=size * requests / duration)
+    return result
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=2000, help="requests per client and case")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 4, 16], help="numbers of concurrent clients")
+    parser.add_argument("--payloads", nargs="+", choices=PAYLOADS, default=list(PAYLOADS))
+    parser.add_argument("--batch-size", type=int, default=20)
+    parser.add_argument("--unix", action="store_true", help="use a unix domain socket")
+    parser.add_argument("--port", type=int, default=51_101)
+    parser.add_argument("--output", help="write the results to this file instead of stdout")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        address = str(Path(tmp, "com.sock")) if args.unix else ("127.0.0.1", args.port)
+        server = serve_page(tmp)
+        url = f"http://127.0.0.1:{server.server_address[1]}/index.html"
+        process = start_showcase(url, address)
+        try:
+            results = list()
+            for payload in args.payloads:
+                results.append(run_clients(address, payload, 1, args.requests, persistent=False))
+                for n in args.clients:
+                    results.append(run_clients(address, payload, n, args.requests, persistent=True))
+            results.append(run_batch(address, args.batch_size, max(1, args.requests // args.batch_size)))
+        finally:
+            try:
+                Client(address).com_quit()
+            except ConnectionError:
+                pass
+            try:
+                process.wait(10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+            server.shutdown()
+
+    report = json.dumps({
+        "benchmark": "communicator",
+        "transport": "unix" if args.unix else "tcp",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }, indent=2)
+    if args.output:
+        Path(args.output).write_text(report)
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Import time regression check of the Qt-free entry points.
+
+Imports the modules with ``python -X importtime`` in a fresh interpreter and
+fails (exit code 1) if any of them loads a Qt module or if the cumulative
+import time of a module exceeds its budget.
+
+    python benchmarks/importtime.py --budget 100
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import subprocess
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+
+_root = Path(__file__).parent.parent
+_src = _root / "src" / "showcase_browser"
+
+# modules that must be importable without Qt
+MODULES = ("client", "ctl")
+FORBIDDEN = re.compile(r"^(PyQt6|sip|PyQt6\..*)$")
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def importtime(module: str) -> dict[str, int]:
+    """The cumulative import times in microseconds of the modules loaded by importing `module`."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=_src,
+        env={"PYTHONPATH": str(_src), "PATH": ""},
+    )
+    if proc.returncode:
+        raise RuntimeError(f"import of {module} failed:\n{proc.stderr}")
+    times = dict()
+    for line in proc.stderr.splitlines():
+        if m := _LINE.match(line):
+            times[m.group(4)] = int(m.group(2))
+    return times
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget", type=float, default=100.0, help="maximum cumulative import time per module in ms")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args()
+
+    results = dict()
+    failed = False
+    for module in MODULES:
+        times = importtime(module)
+        qt = sorted(name for name in times if FORBIDDEN.match(name))
+        total = times.get(module, 0) / 1000
+        results[module] = dict(ms=total, qt=qt)
+        status = "ok"
+        if qt:
+            status = f"FAIL: imports {', '.join(qt)}"
+            failed = True
+        elif total > args.budget:
+            status = f"FAIL: over budget ({args.budget} ms)"
+            failed = True
+        print(f"{module:<12} {total:8.1f} ms  {status}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+class Noop:
+    """Pickled payload of the communicator benchmark (importable by the showcase process)."""
+
+    def __call__(self, sc, res: dict):
+        res["x"] = 1
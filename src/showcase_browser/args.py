@@ -3,8 +3,7 @@ from pathlib import Path
 from shlex import split
 from argparse import ArgumentParser, RawDescriptionHelpFormatter
 
-import webpolicies
-import versions
+import startup
 
 
 class _Null:
@@ -18,11 +17,33 @@ class _Null:
 Null = _Null()
 
 
-parser = ArgumentParser(
+# the parameterization is parsed before Qt is imported (see `--single-instance'),
+# the modules that import the web engine are only loaded for the help and the policy choices
+
+
+class _Parser(ArgumentParser):
+
+    def format_help(self):
+        import versions
+        self.epilog = versions.__versions_msg__
+        return ArgumentParser.format_help(self)
+
+
+class _Policies:
+
+    def __contains__(self, item):
+        import webpolicies
+        return item in webpolicies.MAP
+
+    def __iter__(self):
+        import webpolicies
+        return iter(webpolicies.MAP)
+
+
+parser = _Parser(
     prog="showcase",
     formatter_class=RawDescriptionHelpFormatter,
     description="This minimalistic program turns any website or other document into a stand-alone application.",
-    epilog=versions.__versions_msg__,
     argument_default=Null,
 )
 
@@ -83,7 +104,8 @@ com_addr_group = parser.add_argument_group(
     "Communicator Address",
     description="Define the communicator address. "
                 "For the transmission or the server. "
-                "The default is `127.0.0.3:51001'."
+                "The default is `127.0.0.3:51001'. "
+                "`--com-unix' takes precedence over `--com-host' and `--com-port'."
 )
 com_url_group = parser.add_argument_group(
     "Communicator Url Handle",
@@ -98,6 +120,24 @@ behavior_group = parser.add_argument_group(
     "Behavior",
     description="Web engine behavior attributes."
 )
+storage_group = parser.add_argument_group(
+    "Storage",
+    description="By default, nothing is stored on disk (off the record profile). "
+                "Any of these parameters creates a persistent profile `showcase' "
+                "that is shared by all tabs."
+)
+packages_group = parser.add_argument_group(
+    "Packages",
+    description="Serve sites from local directories or zip archives under "
+                "`showcase-pkg://<name>/<path>' (e.g. `showcase showcase-pkg://kiosk/ "
+                "--package kiosk=./kiosk.zip')."
+)
+telemetry_group = parser.add_argument_group(
+    "Telemetry",
+    description="The load timings of the tabs (including the Navigation Timing and "
+                "Paint Timing entries of the pages) are recorded and can be queried "
+                "via the Communicator command `timings'."
+)
 profile_group = parser.add_argument_group(
     "Local Profiles",
     description="Load the parameterization from a local file or environment variable. "
@@ -248,6 +288,54 @@ try:
         action="store_true",
         help="It is not possible to close the last tab.",
     )
+    taps_group.add_argument(
+        "--tabs-lazy",
+        action="store_true",
+        help="If several urls are passed, only the first tab is loaded at startup. "
+             "The other tabs only hold the url and label until they are "
+             "activated for the first time.",
+    )
+    taps_group.add_argument(
+        "--tabs-preload",
+        action="store",
+        help="With `--tabs-lazy', also load the next `n' tabs after a tab "
+             "has been activated for the first time.",
+        metavar="n",
+        type=int,
+    )
+    taps_group.add_argument(
+        "--tabs-pool-size",
+        action="store",
+        help="Keep `n' pre-built blank browsers for new tabs, "
+             "which are created while the application is idle.",
+        metavar="n",
+        type=int,
+    )
+    taps_group.add_argument(
+        "--tabs-freeze-after",
+        action="store",
+        help="Freeze the page of a tab (lifecycle state `Frozen') "
+             "that has not been focused for `s' seconds.",
+        metavar="s",
+        type=float,
+    )
+    taps_group.add_argument(
+        "--tabs-discard-after",
+        action="store",
+        help="Discard the page of a tab (lifecycle state `Discarded') "
+             "that has not been focused for `s' seconds. "
+             "The page is reloaded when the tab is focused again.",
+        metavar="s",
+        type=float,
+    )
+    taps_group.add_argument(
+        "--tabs-memory-budget",
+        action="store",
+        help="Discard the pages of the least recently used tabs while the "
+             "renderer processes use more than `MB' megabytes in total.",
+        metavar="MB",
+        type=int,
+    )
 except Exception:
     raise
 
@@ -267,14 +355,87 @@ try:
         action="store_true",
         help="Maximize the window at startup.",
     )
+    window_group.add_argument(
+        "--window-screen",
+        action="store",
+        help="Place the window on the screen with index `n'.",
+        metavar="n",
+        type=int,
+    )
+    window_group.add_argument(
+        "--window-open",
+        action="store",
+        help="Open additional windows in the same application and profile, "
+             "each is defined by a quoted parameter string "
+             "(e.g. `--window-open \"example.com --screen 1 --toolbar back url\"'). "
+             "See `--window-open-help' for the parameters. Windows can also be "
+             "opened and closed via the Communicator (window_open, window_close).",
+        metavar="<window>",
+        nargs="+",
+    )
+    window_group.add_argument(
+        "--window-open-help",
+        action="store_true",
+        help="Show the parameters of `--window-open' and exit.",
+    )
 except Exception:
     raise
 
+window_parser = ArgumentParser(
+    prog="--window-open",
+    description="Parameters of an additional window.",
+)
+window_parser.add_argument(
+    "url",
+    action="store",
+    help="The content url. If several are passed, they are shown in tabs.",
+    nargs="*",
+)
+window_parser.add_argument(
+    "--screen",
+    action="store",
+    help="Place the window on the screen with index `n'.",
+    metavar="n",
+    type=int,
+)
+window_parser.add_argument(
+    "--toolbar",
+    action="store",
+    choices=("back", "forward", "refresh", "home", "stop", "url"),
+    default=(),
+    help="The elements of the toolbar.",
+    nargs="+",
+)
+window_parser.add_argument(
+    "--title",
+    action="store",
+    help="Define the window title.",
+)
+window_parser.add_argument(
+    "--no-maximize",
+    action="store_false",
+    dest="maximize",
+    help="Do not maximize the window.",
+)
+window_parser.add_argument(
+    "--fullscreen",
+    action="store_true",
+    help="Show the window in full screen mode.",
+)
+
 try:
     com_group.add_argument(
         "--com",
         action="store_true",
     )
+    com_group.add_argument(
+        "--single-instance",
+        action="store_true",
+        help="If a showcase is already serving the Communicator at the address, "
+             "hand the urls over to it (as new tabs, or loaded in its browser) "
+             "and exit before the web engine is loaded. Otherwise start a new "
+             "showcase that serves the Communicator.",
+    )
 
     com_addr_group.add_argument(
         "--com-host",
@@ -287,6 +448,15 @@ try:
         metavar="port-number",
         type=int,
     )
+    com_addr_group.add_argument(
+        "--com-unix",
+        action="store",
+        help="Use a unix domain socket at <path> instead of a tcp socket "
+             "(not available on Windows). A leading `@' refers to the "
+             "abstract namespace (Linux only). "
+             "The socket file is only accessible to the current user.",
+        metavar="<path>",
+    )
 
     com_url_group.add_argument(
         "--com-try",
@@ -399,10 +569,20 @@ try:
         help="Activate a smooth scroll animation "
              "(ScrollAnimatorEnabled).",
     )
+    behavior_group.add_argument(
+        "--blocklist",
+        action="store",
+        metavar="<file>",
+        nargs="+",
+        help="Block the requests of the pages (except the pages themselves) matched "
+             "by the rules of these files, in hosts file format or simple Adblock Plus "
+             "filters (`||example.com^', `/ads/*.js', exceptions `@@...'). The hit "
+             "counts of the rules are available via the Communicator command `blocklist_hits'.",
+    )
     behavior_group.add_argument(
         "--policies-set",
         action="store",
-        choices=webpolicies.MAP,
+        choices=_Policies(),
         metavar="<policy>",
         nargs="+",
         help="Enable the named policies "
@@ -411,7 +591,7 @@ try:
     behavior_group.add_argument(
         "--policies-unset",
         action="store",
-        choices=webpolicies.MAP,
+        choices=_Policies(),
         metavar="<policy>",
         nargs="+",
         help="Disable the named policies "
@@ -426,6 +606,84 @@ try:
 except Exception:
     raise
 
+try:
+    storage_group.add_argument(
+        "--profile-dir",
+        action="store",
+        help="Define the directory for the persistent data of the profile "
+             "(cookies, local storage, ...).",
+        metavar="<path>",
+    )
+    storage_group.add_argument(
+        "--http-cache-dir",
+        action="store",
+        help="Define the directory of the http disk cache.",
+        metavar="<path>",
+    )
+    storage_group.add_argument(
+        "--http-cache-size",
+        action="store",
+        help="Define the maximum size of the http disk cache in megabytes "
+             "(by default determined by the web engine).",
+        metavar="MB",
+        type=int,
+    )
+    storage_group.add_argument(
+        "--http-cache-type",
+        action="store",
+        choices=("memory", "disk", "none"),
+        help="Define the type of the http cache "
+             "(`disk' is the default of a persistent profile; without "
+             "`--profile-dir' or `--http-cache-dir' the profile is off the record "
+             "and `disk' falls back to `memory').",
+    )
+except Exception:
+    raise
+
+try:
+    packages_group.add_argument(
+        "--package",
+        action="store",
+        help="Serve the directories or zip archives, the name in the url defaults "
+             "to the file name without suffix.",
+        metavar="[name=]<path>",
+        nargs="+",
+    )
+except Exception:
+    raise
+
+try:
+    telemetry_group.add_argument(
+        "--telemetry-size",
+        action="store",
+        help="Keep the last `n' load timings of each tab (default 32).",
+        metavar="n",
+        type=int,
+    )
+    telemetry_group.add_argument(
+        "--trace-startup",
+        action="store",
+        help="Write the timestamps of the startup phases as JSON to this file "
+             "(imports, parameterization, upgrade check, application, browsers, "
+             "window, first load and first paint).",
+        metavar="<path>",
+    )
+    telemetry_group.add_argument(
+        "--trace-startup-chrome",
+        action="store",
+        help="Write the startup phases also as Chrome trace events to this file "
+             "(for chrome://tracing or Perfetto).",
+        metavar="<path>",
+    )
+    telemetry_group.add_argument(
+        "--telemetry-log",
+        action="store",
+        help="Append the load timings as JSON lines to this file.",
+        metavar="<path>",
+    )
+except Exception:
+    raise
+
 try:
     profile_group.add_argument(
         "-p", "--profile",
@@ -447,7 +705,8 @@ try:
 except Exception:
     raise
 
-_args = parser.parse_args()
+with startup.span("args parse"):
+    _args = parser.parse_args()
 
 
 def _parse_string(string: str):
@@ -482,12 +741,13 @@ Could not find `{_args.profile}' (
 
 
 def _file():
-    with open(_args.file) as f:
+    with startup.span("args file", file=_args.file), open(_args.file) as f:
         return _parse_string(f.read())
 
 
 if _args.profile:
-    __args__ = _profile()
+    with startup.span("args profile", profile=_args.profile):
+        __args__ = _profile()
     if _args.file:
         args_d = _file().__dict__
         url = args_d.pop("url")
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import asyncio
+import pickle
+import socket
+from itertools import count
+from typing import TYPE_CHECKING, Callable, Any, AsyncIterator, Iterable
+
+from client import (
+    DEADLINE_GRACE,
+    FRAME_BATCH,
+    FRAME_CALL,
+    FRAME_EVENT,
+    FRAME_EXEC,
+    FRAME_HEADER,
+    FRAME_SUBSCRIBE,
+    FRAME_UNSUBSCRIBE,
+    FRAME_VERSION,
+    HELLO,
+    Address,
+    Call,
+    Event,
+    _Commands,
+    check_hello,
+    dumps,
+    dumps_batch,
+    dumps_call,
+    dumps_subscription,
+    frame,
+    socket_family,
+)
+
+if TYPE_CHECKING:
+    from showcase import Showcase
+
+
+class AsyncClient(_Commands):
+    """
+    asyncio communicator client.
+
+    All commands are coroutines. One persistent connection is opened at the
+    first command (or with ``async with``) and carries any number of
+    concurrent requests, the responses are assigned by the request id.
+    ``timeout`` is the default time limit in seconds for each request and can
+    be overwritten per call of ``com``, ``com_batch`` and ``request``.
+    """
+
+    def __init__(self, server_addr: Address, timeout: float | None = None):
+        self.server_addr = server_addr
+        self.timeout = timeout
+        self.version = 0
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._receiver: asyncio.Task | None = None
+        self._connecting = asyncio.Lock()
+        self._requests: dict[int, asyncio.Future] = dict()
+        self._streams: dict[int, asyncio.Queue[bytes | None]] = dict()
+        self._request_ids = count(1)
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def connect(self):
+        async with self._connecting:
+            if self._writer is not None:
+                return
+            family, addr = socket_family(self.server_addr)
+            if family == socket.AF_INET:
+                reader, writer = await asyncio.open_connection(*addr)
+            else:
+                reader, writer = await asyncio.open_unix_connection(addr)
+            try:
+                writer.write(HELLO + bytes((FRAME_VERSION,)))
+                self.version = check_hello(await reader.readexactly(len(HELLO) + 1))
+            except BaseException:
+                writer.close()
+                raise
+            self._reader, self._writer = reader, writer
+            self._receiver = asyncio.create_task(self._receive())
+
+    async def close(self):
+        if self._receiver is not None:
+            self._receiver.cancel()
+            try:
+                await self._receiver
+            except asyncio.CancelledError:
+                pass
+
+    async def _receive(self):
+        try:
+            while True:
+                kind, flags, rid, length = FRAME_HEADER.unpack(await self._reader.readexactly(FRAME_HEADER.size))
+                data = await self._reader.readexactly(length)
+                if kind == FRAME_EVENT:
+                    if (stream := self._streams.get(rid)) is not None:
+                        stream.put_nowait(data)
+                elif (future := self._requests.pop(rid, None)) is not None and not future.done():
+                    future.set_result(data)
+        except (asyncio.IncompleteReadError, OSError):
+            pass
+        finally:
+            self._writer.close()
+            self._reader = self._writer = self._receiver = None
+            requests, self._requests = self._requests, dict()
+            for future in requests.values():
+                if not future.done():
+                    future.set_exception(ConnectionResetError("the communicator has closed the connection"))
+            for stream in self._streams.values():
+                stream.put_nowait(None)
+
+    async def request(self, kind: int, payload: bytes, timeout: float | None = None) -> bytes:
+        """
+        Send a frame and return the payload of the response.
+
+        The time limit is sent to the server, which answers with a ``TimeoutError``
+        in the response dict. ``asyncio.TimeoutError`` is raised if not even this
+        response is received in time (plus ``DEADLINE_GRACE``).
+        """
+        await self.connect()
+        return await self._request(next(self._request_ids) & 0xFFFFFFFF, kind, payload, timeout)
+
+    async def _request(self, rid: int, kind: int, payload: bytes, timeout: float | None) -> bytes:
+        if timeout is None:
+            timeout = self.timeout
+        future = asyncio.get_running_loop().create_future()
+        self._requests[rid] = future
+        try:
+            self._writer.write(frame(kind, rid, payload, timeout))
+            await self._writer.drain()
+            return await asyncio.wait_for(future, None if timeout is None else timeout + DEADLINE_GRACE)
+        finally:
+            self._requests.pop(rid, None)
+
+    async def com(self, exec: bytes | Callable[[Showcase, dict], Any] | object, timeout: float | None = None) -> dict:
+        return pickle.loads(await self.request(FRAME_EXEC, dumps(exec), timeout))
+
+    async def com_call(self, name: str, *args, timeout: float | None = None, **kwargs) -> dict:
+        return pickle.loads(await self.request(FRAME_CALL, dumps_call(Call(name, args, kwargs)), timeout))
+
+    async def com_batch(
+            self,
+            operations: Iterable[Call | bytes | Callable[[Showcase, dict], Any] | object],
+            stop_on_error: bool = False,
+            timeout: float | None = None,
+    ) -> list[dict]:
+        return pickle.loads(await self.request(FRAME_BATCH, dumps_batch(operations, stop_on_error), timeout))
+
+    async def com_ping(self):
+        try:
+            return await self.com_call("ping")
+        except (ConnectionError, FileNotFoundError):
+            return False
+
+    async def subscribe(self, events: Iterable[str] = None, tabs: Iterable[int] = None, tab_ids: Iterable[int] = None) -> AsyncIterator[Event]:
+        """
+        Subscribe to events on the shared connection and yield them
+        (see ``Client.subscribe``). The subscription is canceled with the generator.
+        """
+        await self.connect()
+        rid = next(self._request_ids) & 0xFFFFFFFF
+        stream = self._streams[rid] = asyncio.Queue()
+        try:
+            if e := pickle.loads(await self._request(rid, FRAME_SUBSCRIBE, dumps_subscription(events, tabs, tab_ids), None)).get("!"):
+                raise e
+            while (data := await stream.get()) is not None:
+                yield Event.from_dict(pickle.loads(data))
+            raise ConnectionResetError("the communicator has closed the connection")
+        finally:
+            del self._streams[rid]
+            if self._writer is not None:
+                self._writer.write(FRAME_HEADER.pack(FRAME_UNSUBSCRIBE, 0, rid, 0))
@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import re
+from collections import Counter, deque
+from ipaddress import ip_address
+
+from PyQt6.QtCore import QObject
+from PyQt6.QtWebEngineCore import QWebEngineUrlRequestInfo, QWebEngineUrlRequestInterceptor
+
+
+_DOMAIN = re.compile(r"[a-z0-9_-]+(\.[a-z0-9_-]+)+")
+_ABP_DOMAIN = re.compile(r"\|\|([a-z0-9_.-]+)\^?")
+_TOKEN = re.compile(r"[a-z0-9%]+")
+_WILDCARDS = re.compile(r"[*^|]+")
+_HOSTS_IGNORED = {"localhost", "localhost.localdomain", "local", "broadcasthost", "ip6-localhost", "ip6-loopback"}
+# the end of the trie path of a domain, labels are never empty
+_END = ""
+
+
+def _abp_regex(pattern: str) -> str:
+    """Translate the ABP `pattern` (without options) into a regular expression."""
+    regex = ""
+    if pattern.startswith("||"):
+        regex = r"^[a-z][a-z0-9+.-]*://(?:[^/?#]*\.)?"
+        pattern = pattern[2:]
+    elif pattern.startswith("|"):
+        regex = "^"
+        pattern = pattern[1:]
+    end = pattern.endswith("|")
+    if end:
+        pattern = pattern[:-1]
+    for c in pattern:
+        if c == "*":
+            regex += ".*"
+        elif c == "^":
+            regex += r"(?:[^\w.%-]|$)"
+        else:
+            regex += re.escape(c)
+    return regex + ("$" if end else "")
+
+
+def _abp_token(pattern: str) -> str | None:
+    """
+    The longest literal of `pattern` which appears as a whole token in every
+    matching url, or None.
+    """
+    anchored = pattern.startswith("|")
+    body = pattern.lstrip("|")
+    end = len(body) - body.endswith("|")
+    best = None
+    for m in _TOKEN.finditer(body):
+        before = body[m.start() - 1] if m.start() else None
+        after = body[m.end()] if m.end() < end else None
+        if before is None and not anchored or before == "*":
+            continue
+        if after is None and not body.endswith("|") or after == "*":
+            continue
+        if best is None or len(m.group()) > len(best):
+            best = m.group()
+    return best
+
+
+def _abp_literal(pattern: str) -> str:
+    """The longest literal part of `pattern`, which is a substring of every matching url."""
+    return max(_WILDCARDS.split(pattern), key=len)
+
+
+class _Literals:
+    """
+    Url patterns indexed by a literal part, the literals are searched all at
+    once with an Aho-Corasick automaton.
+    """
+
+    def __init__(self):
+        self.patterns: dict[str, list[tuple[re.Pattern, str]]] = dict()
+        self._goto: list[dict[str, int]] | None = None
+        self._fail: list[int] = list()
+        self._out: list[tuple[str, ...]] = list()
+
+    def __bool__(self):
+        return bool(self.patterns)
+
+    def add(self, literal: str, regex: re.Pattern, rule: str):
+        self.patterns.setdefault(literal, list()).append((regex, rule))
+        self._goto = None
+
+    def _build(self):
+        goto: list[dict[str, int]] = [dict()]
+        out: list[tuple[str, ...]] = [()]
+        for literal in self.patterns:
+            state = 0
+            for c in literal:
+                if (nxt := goto[state].get(c)) is None:
+                    nxt = goto[state][c] = len(goto)
+                    goto.append(dict())
+                    out.append(())
+                state = nxt
+            out[state] = (literal,)
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for c, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and c not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(c, 0)
+                out[nxt] += out[fail[nxt]]
+        self._goto, self._fail, self._out = goto, fail, out
+
+    def search(self, url: str) -> str | None:
+        if self._goto is None:
+            self._build()
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for c in url:
+            while state and c not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(c, 0)
+            for literal in out[state]:
+                for regex, rule in self.patterns[literal]:
+                    if regex.search(url):
+                        return rule
+        return None
+
+
+class _Rules:
+    """
+    Domain rules in a trie of reversed labels, url patterns indexed by a token
+    or else by a literal part.
+    """
+
+    def __init__(self):
+        self.domains: dict = dict()
+        self.tokens: dict[str, list[tuple[re.Pattern, str]]] = dict()
+        self.literals = _Literals()
+        # patterns without any literal
+        self.generic: list[tuple[str, str]] = list()
+        self._generic: re.Pattern | None = None
+
+    def add_domain(self, domain: str, rule: str):
+        node = self.domains
+        for label in reversed(domain.split(".")):
+            node = node.setdefault(label, dict())
+        node.setdefault(_END, rule)
+
+    def add_pattern(self, pattern: str, rule: str):
+        regex = _abp_regex(pattern)
+        if (token := _abp_token(pattern)) is not None:
+            self.tokens.setdefault(token, list()).append((re.compile(regex), rule))
+        elif literal := _abp_literal(pattern):
+            self.literals.add(literal, re.compile(regex), rule)
+        else:
+            self.generic.append((regex, rule))
+            self._generic = None
+
+    def match_domain(self, host: str) -> str | None:
+        node = self.domains
+        for label in reversed(host.split(".")):
+            if (node := node.get(label)) is None:
+                return None
+            if _END in node:
+                return node[_END]
+        return None
+
+    def match_url(self, url: str) -> str | None:
+        if self.tokens:
+            for token in _TOKEN.findall(url):
+                for regex, rule in self.tokens.get(token, ()):
+                    if regex.search(url):
+                        return rule
+        if self.literals and (rule := self.literals.search(url)) is not None:
+            return rule
+        if self.generic:
+            if self._generic is None:
+                # one alternation, the group of the matching alternative identifies the rule
+                self._generic = re.compile("|".join(f"({regex})" for regex, _ in self.generic))
+            if m := self._generic.search(url):
+                return self.generic[m.lastindex - 1][1]
+        return None
+
+    def match(self, url: str, host: str) -> str | None:
+        return self.match_domain(host) or self.match_url(url)
+
+
+class Blocklist:
+    """
+    Rules in the format of hosts files (``0.0.0.0 example.com``), plain domain
+    lists or simple Adblock Plus filters (``||example.com^``, ``/ads/*.js``,
+    exceptions ``@@...``). A domain matches its subdomains as well.
+
+    Adblock Plus rules with options (``$...``) and element hiding rules are ignored.
+    ``hits`` counts the matches per rule.
+    """
+
+    def __init__(self):
+        self.block = _Rules()
+        self.allow = _Rules()
+        self.hits: Counter[str] = Counter()
+        self.rules = 0
+
+    def load(self, path: str):
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                self.add(line)
+
+    def add(self, line: str):
+        line = line.strip()
+        if not line or line[0] in "!#[" or "##" in line or "#@#" in line or "#?#" in line:
+            return
+        rule = line
+        line = line.split("#", 1)[0].strip().lower() if " " in line or "\t" in line else line.lower()
+        fields = line.split()
+        if len(fields) > 1:
+            try:
+                ip_address(fields[0])
+            except ValueError:
+                return
+            for domain in fields[1:]:
+                if domain not in _HOSTS_IGNORED and _DOMAIN.fullmatch(domain):
+                    self.block.add_domain(domain, domain)
+                    self.rules += 1
+            return
+        if _DOMAIN.fullmatch(line):
+            self.block.add_domain(line, rule)
+            self.rules += 1
+            return
+        rules = self.block
+        if line.startswith("@@"):
+            rules = self.allow
+            line = line[2:]
+        if "$" in line:
+            return
+        if m := _ABP_DOMAIN.fullmatch(line):
+            rules.add_domain(m.group(1).strip("."), rule)
+        else:
+            rules.add_pattern(line, rule)
+        self.rules += 1
+
+    def __len__(self):
+        return self.rules
+
+    def match(self, url: str, host: str) -> str | None:
+        """The rule blocking `url` (on `host`), or None."""
+        url = url.lower()
+        host = host.lower()
+        if (rule := self.block.match(url, host)) is None:
+            return None
+        if (exception := self.allow.match(url, host)) is not None:
+            self.hits[exception] += 1
+            return None
+        self.hits[rule] += 1
+        return rule
+
+
+class BlocklistInterceptor(QWebEngineUrlRequestInterceptor):
+    """Blocks the requests matched by `blocklist`, except for the main frame of a tab."""
+
+    def __init__(self, blocklist: Blocklist, parent: QObject = None):
+        QWebEngineUrlRequestInterceptor.__init__(self, parent)
+        self.blocklist = blocklist
+
+    def interceptRequest(self, info: QWebEngineUrlRequestInfo):
+        if info.resourceType() == QWebEngineUrlRequestInfo.ResourceType.ResourceTypeMainFrame:
+            return
+        url = info.requestUrl()
+        if self.blocklist.match(url.toString(), url.host()) is not None:
+            info.block(True)
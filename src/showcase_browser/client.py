@@ -0,0 +1,500 @@
+from __future__ import annotations
+
+import marshal
+import pickle
+import socket
+import struct
+from contextlib import contextmanager
+from itertools import count
+from queue import Queue
+from sys import stderr
+from traceback import print_exception
+from types import FunctionType
+from typing import TYPE_CHECKING, Callable, Any, Iterable, Iterator, NamedTuple
+
+
+if TYPE_CHECKING:
+    from showcase import Showcase
+
+
+EOT = b"\x04"
+PICKLE_PROTOCOL = 4
+PICKLE_HEADER = b"\x80"
+MARSHAL_VERSION = 4
+MARSHAL_HEADER = b"\xE3"
+
+BUFFER_SIZE = 65536
+MAX_FRAME_SIZE = 64 << 20
+# connection opening: HELLO + <version byte>, the server answers with the negotiated version
+HELLO = b"\x16SC"
+FRAME_VERSION = 1
+# kind, flags, request id, payload length
+FRAME_HEADER = struct.Struct("!BBII")
+# the payload begins with the time limit of the request in seconds
+FLAG_DEADLINE = 0x01
+DEADLINE = struct.Struct("!d")
+# additional waiting time of the clients for the timeout response of the server
+DEADLINE_GRACE = 1.0
+FRAME_EXEC = 1
+FRAME_RESULT = 2
+FRAME_BATCH = 3
+FRAME_SUBSCRIBE = 4
+FRAME_UNSUBSCRIBE = 5
+FRAME_EVENT = 6
+FRAME_CALL = 7
+# events are dropped for subscribers whose send buffer exceeds this size
+EVENT_BACKLOG = 1 << 24
+
+# named commands of the showcase (see ``Client.com_call``)
+COMMANDS = (
+    "back",
+    "blocklist_hits",
+    "evaluate",
+    "forward",
+    "handoff",
+    "reload",
+    "home",
+    "load",
+    "stop_load",
+    "quit",
+    "ping",
+    "policies",
+    "policy_set",
+    "tab_add",
+    "tab_change",
+    "tab_close",
+    "tab_info",
+    "tab_list",
+    "tab_load",
+    "tab_set_label",
+    "timings",
+    "wait_load",
+    "window_close",
+    "window_list",
+    "window_open",
+)
+EVENTS = (
+    "load_started",
+    "load_progress",
+    "load_finished",
+    "url_changed",
+    "title_changed",
+    "tab_changed",
+)
+
+
+class Call(NamedTuple):
+    """Named command as an operation of ``Client.com_batch``."""
+
+    name: str
+    args: tuple = ()
+    kwargs: dict = {}
+
+
+class Event(NamedTuple):
+    """Event of a subscription stream (see ``Client.subscribe``)."""
+
+    event: str
+    time: float
+    tab: int | None = None
+    url: str | None = None
+    title: str | None = None
+    progress: int | None = None
+    ok: bool | None = None
+    duration: float | None = None
+    tab_id: int | None = None
+    # id of the additional window (see ``window_open``), None for the main window
+    window: int | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Event:
+        return cls(**{k: v for k, v in data.items() if k in cls._fields})
+
+
+Address = tuple[str, int] | str
+
+
+def frame(kind: int, rid: int, payload: bytes, timeout: float | None = None) -> bytes:
+    if timeout is None:
+        return FRAME_HEADER.pack(kind, 0, rid, len(payload)) + payload
+    return FRAME_HEADER.pack(kind, FLAG_DEADLINE, rid, DEADLINE.size + len(payload)) + DEADLINE.pack(timeout) + payload
+
+
+def socket_family(addr: Address) -> tuple[int, tuple[str, int] | str]:
+    """
+    Get the socket family and the socket address for `addr`.
+
+    Strings are interpreted as the path of a unix domain socket, a leading
+    ``@`` refers to the abstract namespace (Linux only).
+    Tuples are interpreted as (host, port) of an internet socket.
+    """
+    if isinstance(addr, str):
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError("unix domain sockets are not supported on this platform")
+        if addr.startswith("@"):
+            return socket.AF_UNIX, "\0" + addr[1:]
+        return socket.AF_UNIX, addr
+    return socket.AF_INET, addr
+
+
+def format_address(addr: Address) -> str:
+    if isinstance(addr, str):
+        return addr
+    return f"{addr[0]}:{addr[1]}"
+
+
+def create_socket(addr: Address) -> tuple[socket.socket, tuple[str, int] | str]:
+    family, addr = socket_family(addr)
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    if family == socket.AF_INET:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    return sock, addr
+
+
+def dumps(exec: bytes | Callable[[Showcase, dict], Any] | object) -> bytes:
+    """
+    Get the transmission format of an executable byte-string, object or function.
+    """
+    msg = "[??]"
+    if not isinstance(exec, bytes):
+        try:
+            if (t := type(exec)) == FunctionType:
+                msg = f"{marshal} (version={MARSHAL_VERSION})"
+                exec = marshal.dumps(exec.__code__, MARSHAL_VERSION)
+            else:
+                msg = f"{pickle} (protocol={PICKLE_PROTOCOL})"
+                exec = pickle.dumps(exec, PICKLE_PROTOCOL)
+        except Exception as e:
+            print_exception(e)
+            stderr.flush()
+            print(f"\nThe above error occurred when picking {exec} which has the type {t}.\nObjects of type {t} are picked with {msg} for the transaction.\n", file=stderr)
+            exit(1)
+    return exec
+
+
+def dumps_call(call: Call) -> bytes:
+    return pickle.dumps(tuple(call), PICKLE_PROTOCOL)
+
+
+def dumps_batch(
+        operations: Iterable[Call | bytes | Callable[[Showcase, dict], Any] | object],
+        stop_on_error: bool = False,
+) -> bytes:
+    return pickle.dumps((
+        [(FRAME_CALL, dumps_call(o)) if isinstance(o, Call) else (FRAME_EXEC, dumps(o)) for o in operations],
+        stop_on_error,
+    ), PICKLE_PROTOCOL)
+
+
+def dumps_subscription(events: Iterable[str] = None, tabs: Iterable[int] = None, tab_ids: Iterable[int] = None) -> bytes:
+    return pickle.dumps((
+        None if events is None else tuple(events),
+        None if tabs is None else tuple(tabs),
+        None if tab_ids is None else tuple(tab_ids),
+    ), PICKLE_PROTOCOL)
+
+
+class _Commands:
+
+    def request(self, kind: int, payload: bytes, timeout: float | None = None) -> bytes:
+        raise NotImplementedError
+
+    def com(self, exec: bytes | Callable[[Showcase, dict], Any] | object, timeout: float | None = None) -> dict:
+        """
+        Send an executable byte-string, object or function to the ``showcase``.
+
+        Strings are executed via ``exec``, the ``showcase`` object can be accessed
+        via the globals (`showcase` or `sc`). The response dict is created from the locals.
+
+        Objects and functions are called and receive the storefront object as the
+        first parameter and the response dict as the second parameter.
+
+        With a `timeout` in seconds, the response dict contains a ``TimeoutError``
+        at key `!` if the ``showcase`` does not finish the request in time.
+
+        Returns the response dict.
+        """
+        return pickle.loads(self.request(FRAME_EXEC, dumps(exec), timeout))
+
+    def com_call(self, name: str, *args, timeout: float | None = None, **kwargs) -> dict:
+        """
+        Call the named command of the ``showcase`` (see ``COMMANDS``) with the
+        arguments. No code is transmitted or compiled.
+
+        Returns the response dict, the return value of the command is
+        stored under the key `return`. Commands such as `wait_load` and
+        `evaluate` are finished asynchronously in the ``showcase``, a `timeout`
+        is recommended for them.
+        """
+        return pickle.loads(self.request(FRAME_CALL, dumps_call(Call(name, args, kwargs)), timeout))
+
+    def com_batch(
+            self,
+            operations: Iterable[Call | bytes | Callable[[Showcase, dict], Any] | object],
+            stop_on_error: bool = False,
+            timeout: float | None = None,
+    ) -> list[dict]:
+        """
+        Execute several operations (as for ``com``, or ``Call``'s of named commands)
+        in one transaction and in one pass of the main thread of the ``showcase``.
+
+        Returns the response dicts in the order of the operations. With
+        ``stop_on_error``, the execution is stopped after the first failed
+        operation, the list then ends with the response of this operation.
+        The `timeout` applies to the whole batch.
+        """
+        return pickle.loads(self.request(FRAME_BATCH, dumps_batch(operations, stop_on_error), timeout))
+
+    def com_back(self):
+        return self.com_call("back")
+
+    def com_forward(self):
+        return self.com_call("forward")
+
+    def com_reload(self):
+        return self.com_call("reload")
+
+    def com_home(self):
+        return self.com_call("home")
+
+    def com_load(
+            self,
+            url: str,
+            tab_index: int = None,
+            tab_append: bool = None,
+            tab_id: int = None,
+    ):
+        if tab_append:
+            return self.com_call("tab_add", url)
+        elif tab_index is not None or tab_id is not None:
+            return self.com_call("tab_load", url, tab_index, tab_id)
+        else:
+            return self.com_call("load", url)
+
+    def com_stop_load(self):
+        return self.com_call("stop_load")
+
+    def com_quit(self):
+        return self.com_call("quit")
+
+    def com_tab_change(self, index: int = None, tab_id: int = None):
+        return self.com_call("tab_change", index, tab_id)
+
+    def com_tab_close(self, index: int = None, tab_id: int = None):
+        if index == -1:
+            index = None
+        return self.com_call("tab_close", index, tab_id)
+
+    def com_tab_list(self):
+        return self.com_call("tab_list")
+
+    def com_tab_info(self, index: int = None, tab_id: int = None):
+        return self.com_call("tab_info", index, tab_id)
+
+    def com_ping(self):
+        try:
+            return self.com_call("ping")
+        except (ConnectionError, FileNotFoundError):
+            return False
+
+    def com_blocklist_hits(self):
+        return self.com_call("blocklist_hits")
+
+    def com_handoff(self, urls: list[str]):
+        return self.com_call("handoff", urls)
+
+    def com_window_open(
+            self,
+            url: str | list[str] = None,
+            screen: int = None,
+            toolbar: tuple[str, ...] = (),
+            title: str = None,
+            maximize: bool = True,
+            fullscreen: bool = False,
+    ):
+        return self.com_call("window_open", url, screen, toolbar, title, maximize, fullscreen)
+
+    def com_window_close(self, window_id: int):
+        return self.com_call("window_close", window_id)
+
+    def com_window_list(self):
+        return self.com_call("window_list")
+
+    def com_timings(self, index: int = None, tab_id: int = None):
+        return self.com_call("timings", index, tab_id)
+
+    def com_policies(self, index: int = None, tab_id: int = None):
+        return self.com_call("policies", index, tab_id)
+
+    def com_policy_set(self, name: str, value: bool, index: int = None, tab_id: int = None):
+        return self.com_call("policy_set", name, value, index, tab_id)
+
+
+def recv_exactly(sock: socket.socket, n: int) -> bytearray:
+    buf = bytearray(n)
+    with memoryview(buf) as view:
+        pos = 0
+        while pos < n:
+            if not (k := sock.recv_into(view[pos:])):
+                raise ConnectionResetError("the communicator has closed the connection")
+            pos += k
+    return buf
+
+
+def check_hello(data: bytes) -> int:
+    if data[:len(HELLO)] != HELLO or not data[len(HELLO)]:
+        raise ConnectionError(f"unexpected handshake from the communicator: {bytes(data)!r}")
+    return data[len(HELLO)]
+
+
+class Client(_Commands):
+    """
+    Communicator client.
+
+    By default, a new connection is established for each command. With
+    ``persistent=True`` the connection is opened at the first command and kept
+    for all further commands until ``close`` is called (or the ``with`` block
+    is left). ``timeout`` is the default time limit in seconds for each request.
+    """
+
+    def __init__(self, server_addr: Address, persistent: bool = False, timeout: float | None = None):
+        self.server_addr = server_addr
+        self.persistent = persistent
+        self.timeout = timeout
+        self.socket: socket.socket | None = None
+        self.version = 0
+        self._request_ids = count(1)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _connect(self) -> socket.socket:
+        sock, addr = create_socket(self.server_addr)
+        try:
+            sock.connect(addr)
+        except BaseException:
+            sock.close()
+            raise
+        return sock
+
+    def connect(self):
+        """Open the persistent connection (done implicitly by the first command)."""
+        if self.socket is None:
+            sock = self._connect()
+            try:
+                sock.sendall(HELLO + bytes((FRAME_VERSION,)))
+                self.version = check_hello(recv_exactly(sock, len(HELLO) + 1))
+            except BaseException:
+                sock.close()
+                raise
+            self.socket = sock
+
+    def close(self):
+        if self.socket is not None:
+            self.socket.close()
+            self.socket = None
+
+    def _request(self, sock: socket.socket, kind: int, payload: bytes, timeout: float | None) -> bytearray:
+        rid = next(self._request_ids) & 0xFFFFFFFF
+        sock.sendall(frame(kind, rid, payload, timeout))
+        return self._response(sock, rid)
+
+    def _response(self, sock: socket.socket, rid: int) -> bytearray:
+        kind, flags, _rid, length = FRAME_HEADER.unpack(recv_exactly(sock, FRAME_HEADER.size))
+        data = recv_exactly(sock, length)
+        if _rid != rid:
+            raise ConnectionError(f"response for request {_rid} received, expected {rid}")
+        return data
+
+    def request(self, kind: int, payload: bytes, timeout: float | None = None) -> bytearray:
+        """
+        Send a frame and return the payload of the response.
+
+        The socket raises ``TimeoutError`` if not even the timeout response of
+        the server is received within the time limit (plus ``DEADLINE_GRACE``).
+        """
+        if timeout is None:
+            timeout = self.timeout
+        if self.persistent:
+            self.connect()
+            try:
+                self.socket.settimeout(None if timeout is None else timeout + DEADLINE_GRACE)
+                return self._request(self.socket, kind, payload, timeout)
+            except OSError:
+                self.close()
+                raise
+        with self._connect() as sock:
+            sock.settimeout(None if timeout is None else timeout + DEADLINE_GRACE)
+            rid = next(self._request_ids) & 0xFFFFFFFF
+            sock.sendall(HELLO + bytes((FRAME_VERSION,)) + frame(kind, rid, payload, timeout))
+            self.version = check_hello(recv_exactly(sock, len(HELLO) + 1))
+            return self._response(sock, rid)
+
+    def subscribe(self, events: Iterable[str] = None, tabs: Iterable[int] = None, tab_ids: Iterable[int] = None) -> Iterator[Event]:
+        """
+        Open a subscription stream on a separate connection and yield the events.
+
+        `events` restricts the stream to the named event types (see ``EVENTS``),
+        `tab_ids` to the events of the tabs with the given stable ids and `tabs`
+        to those of the tabs at the given indexes (which change when tabs are
+        closed); all by default. The connection is closed with the generator.
+        """
+        with self._connect() as sock:
+            rid = next(self._request_ids) & 0xFFFFFFFF
+            payload = dumps_subscription(events, tabs, tab_ids)
+            sock.sendall(HELLO + bytes((FRAME_VERSION,)) + frame(FRAME_SUBSCRIBE, rid, payload))
+            check_hello(recv_exactly(sock, len(HELLO) + 1))
+            if e := pickle.loads(self._response(sock, rid)).get("!"):
+                raise e
+            while True:
+                kind, flags, _rid, length = FRAME_HEADER.unpack(recv_exactly(sock, FRAME_HEADER.size))
+                yield Event.from_dict(pickle.loads(recv_exactly(sock, length)))
+
+
+class ClientPool(_Commands):
+    """
+    Thread safe pool of persistent clients.
+
+    Each command borrows a client from the pool for its duration,
+    the connections are established when needed.
+    """
+
+    def __init__(self, server_addr: Address, size: int = 4, timeout: float | None = None):
+        self.server_addr = server_addr
+        self._clients: Queue[Client] = Queue(size)
+        for _ in range(size):
+            self._clients.put(Client(server_addr, persistent=True, timeout=timeout))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @contextmanager
+    def client(self) -> Iterator[Client]:
+        client = self._clients.get()
+        try:
+            yield client
+        finally:
+            self._clients.put(client)
+
+    def request(self, kind: int, payload: bytes, timeout: float | None = None) -> bytearray:
+        with self.client() as client:
+            return client.request(kind, payload, timeout)
+
+    def close(self):
+        for _ in range(self._clients.maxsize):
+            with self.client() as client:
+                client.close()
+
+
+def __getattr__(name: str):
+    # asyncio takes most of the import time of this module, it is only imported with the AsyncClient
+    if name == "AsyncClient":
+        from async_client import AsyncClient
+        return AsyncClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,151 +1,441 @@
 from __future__ import annotations
 
+import errno
 import marshal
+import os
 import pickle
+import selectors
 import socket
-from queue import Queue
-from sys import stderr
-from traceback import print_exception
-from types import FunctionType
-from typing import Callable, Any
+import stat
+import struct
+from functools import lru_cache, partial
+from heapq import heappop, heappush
+from itertools import count
+from queue import Queue, Empty
+from time import monotonic
+from types import CodeType
+from typing import Iterator
 
 from PyQt6.QtCore import QObject, pyqtSignal
 
-try:
-    from showcase import Showcase
-except ImportError:
-    pass
+# the protocol is defined in the Qt-free client module, names used by the showcase are re-exported
+from client import (
+    BUFFER_SIZE,
+    COMMANDS,
+    DEADLINE,
+    EOT,
+    EVENTS,
+    EVENT_BACKLOG,
+    FLAG_DEADLINE,
+    FRAME_BATCH,
+    FRAME_CALL,
+    FRAME_EVENT,
+    FRAME_EXEC,
+    FRAME_HEADER,
+    FRAME_RESULT,
+    FRAME_SUBSCRIBE,
+    FRAME_UNSUBSCRIBE,
+    FRAME_VERSION,
+    HELLO,
+    MARSHAL_HEADER,
+    MARSHAL_VERSION,
+    MAX_FRAME_SIZE,
+    PICKLE_HEADER,
+    PICKLE_PROTOCOL,
+    Address,
+    Call,
+    Client,
+    ClientPool,
+    Event,
+    create_socket,
+    dumps,
+    format_address,
+)
 
+__all__ = (
+    "BUFFER_SIZE", "CODE_CACHE_SIZE", "COMMANDS", "DEADLINE", "EOT", "EVENTS", "EVENT_BACKLOG",
+    "FLAG_DEADLINE", "FRAME_BATCH", "FRAME_CALL", "FRAME_EVENT", "FRAME_EXEC", "FRAME_HEADER",
+    "FRAME_RESULT", "FRAME_SUBSCRIBE", "FRAME_UNSUBSCRIBE", "FRAME_VERSION", "HELLO",
+    "MARSHAL_HEADER", "MARSHAL_VERSION", "MAX_FRAME_SIZE", "PICKLE_HEADER", "PICKLE_PROTOCOL",
+    "Address", "Call", "Client", "ClientPool", "Event", "ServerSide",
+    "compile_source", "create_socket", "dumps", "format_address", "load_code",
+)
 
-EOT = b"\x04"
-PICKLE_PROTOCOL = 4
-PICKLE_HEADER = b"\x80"
-MARSHAL_VERSION = 4
-MARSHAL_HEADER = b"\xE3"
+
+def __getattr__(name: str):
+    # like ``client.AsyncClient`` (not in __all__), asyncio is only imported with the AsyncClient
+    if name == "AsyncClient":
+        from async_client import AsyncClient
+        return AsyncClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# number of compiled byte-strings and functions kept by ``compile_source`` and ``load_code``
+CODE_CACHE_SIZE = 256
+
+
+class _Connection:
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.buf = bytearray(BUFFER_SIZE)
+        self.view = memoryview(self.buf)
+        self.start = 0
+        self.end = 0
+        self.out = bytearray()
+        self.sent = 0
+        self.events = 0
+        self.reading = True
+        self.outstanding = 0
+        self.closed = False
+        # None: not yet known, 0: legacy EOT transmission, >0: frame version
+        self.version: int | None = None
+        # request id of the subscription: (events, tab indexes, tab ids)
+        self.subscriptions: dict[int, tuple[frozenset[str] | None, frozenset[int] | None, frozenset[int] | None]] = dict()
+
+    def recv(self) -> int:
+        if self.end == len(self.buf):
+            self.reserve(self.end - self.start + 1)
+        n = self.sock.recv_into(self.view[self.end:])
+        self.end += n
+        return n
+
+    def reserve(self, size: int):
+        """Make sure that `size` bytes from the current start fit into the buffer."""
+        if self.start + size <= len(self.buf):
+            return
+        if size > len(self.buf):
+            buf = bytearray(max(size, 2 * len(self.buf)))
+            buf[:self.end - self.start] = self.view[self.start:self.end]
+            self.view.release()
+            self.buf = buf
+            self.view = memoryview(buf)
+        else:
+            self.buf[:self.end - self.start] = self.view[self.start:self.end]
+        self.end -= self.start
+        self.start = 0
+
+    def pending(self) -> int:
+        return self.end - self.start
+
+    def take(self, n: int) -> bytes:
+        data = bytes(self.view[self.start:self.start + n])
+        self.start += n
+        if self.start == self.end:
+            self.start = self.end = 0
+        return data
+
+    def frames(self) -> Iterator[tuple[int, int, int, bytes]]:
+        while self.pending() >= FRAME_HEADER.size:
+            kind, flags, rid, length = FRAME_HEADER.unpack_from(self.buf, self.start)
+            if length > MAX_FRAME_SIZE:
+                raise ValueError(f"frame size {length} exceeds {MAX_FRAME_SIZE}")
+            if self.pending() < FRAME_HEADER.size + length:
+                # receive the rest of the frame directly to its final position, the
+                # buffer grows with the received data, not with the declared length
+                self.reserve(min(FRAME_HEADER.size + length, self.pending() + BUFFER_SIZE))
+                return
+            self.start += FRAME_HEADER.size
+            yield kind, flags, rid, self.take(length)
 
 
 class ServerSide(QObject):
+    """
+    Event driven communicator server.
+
+    Any number of clients can be connected at the same time. Each received
+    request is tagged with an id and put into the ``i_pipe`` together with
+    the ``pipesig`` signal for the execution in the main thread. The main
+    thread hands the response back via ``reply``, responses are sent in the
+    order in which they are finished.
+
+    Clients that open the connection with ``HELLO`` and their frame version
+    receive the negotiated version in return and then communicate via
+    length-prefixed frames (``FRAME_HEADER``) for any number of requests.
+    Responses carry the request id of the client and can arrive in any order.
+    Other connections are treated as legacy transmission: one request
+    terminated by ``EOT`` and the pickled response, then the connection is closed.
+
+    A request with a deadline (``FLAG_DEADLINE``) that is not finished in
+    time is answered with a ``TimeoutError``, a later response of the main
+    thread is discarded.
+
+    Framed connections can subscribe to the events that the main thread
+    hands over via ``publish``. The events are filtered here and sent as
+    ``FRAME_EVENT`` frames with the request id of the subscription.
+    """
 
     pipesig = pyqtSignal()
 
-    def __init__(self, i_pipe: Queue[bytes], o_pipe: Queue[bytes], addr: tuple[str, int]):
+    def __init__(self, i_pipe: Queue[tuple[int, int, bytes, float | None]], o_pipe: Queue[tuple[int, bytes]], addr: Address):
         QObject.__init__(self)
         self.i_pipe = i_pipe
         self.o_pipe = o_pipe
         self.address = addr
 
-        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self.socket.bind(self.address)
-        self.socket.listen(1)
+        self.socket, addr = create_socket(addr)
+        self._path = None
+        if self.socket.family == socket.AF_INET:
+            self.socket.bind(addr)
+        else:
+            if not addr.startswith("\0"):
+                self._path = addr
+                self._unlink_stale()
+            self.socket.bind(addr)
+            if self._path:
+                # restrict the access to the current user
+                os.chmod(self._path, 0o600)
+        self.socket.listen(socket.SOMAXCONN)
+        self.socket.setblocking(False)
+
+        self.selector = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._request_ids = count()
+        self._pending: dict[int, tuple[_Connection, int]] = dict()
+        self._deadlines: list[tuple[float, int, float]] = list()
+        self._events: Queue[tuple[str, int | None, int | None, bytes]] = Queue()
+        self._subscribed: set[_Connection] = set()
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribed)
+
+    def _unlink_stale(self):
+        try:
+            if not stat.S_ISSOCK(os.stat(self._path).st_mode):
+                return
+        except FileNotFoundError:
+            return
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self._path)
+        except ConnectionRefusedError:
+            os.unlink(self._path)
+        else:
+            raise OSError(errno.EADDRINUSE, f"a communicator is already running at {self._path}")
+        finally:
+            sock.close()
+
+    def close(self):
+        """Remove the socket file of a unix domain socket."""
+        if self._path:
+            try:
+                os.unlink(self._path)
+            except FileNotFoundError:
+                pass
+            self._path = None
+
+    def reply(self, rid: int, data: bytes):
+        """Hand over the response for request `rid` (thread safe, called from the main thread)."""
+        self.o_pipe.put((rid, data))
+        self._wake_w.send(b"\0")
+
+    def publish(self, event: dict):
+        """Hand over an event for the subscribers (thread safe, called from the main thread)."""
+        self._events.put((event["event"], event.get("tab"), event.get("tab_id"), pickle.dumps(event)))
+        self._wake_w.send(b"\0")
 
     def run(self):
+        self.selector.register(self.socket, selectors.EVENT_READ, self._accept)
+        self.selector.register(self._wake_r, selectors.EVENT_READ, self._wakeup)
         while True:
-            conn, addr = self.socket.accept()
-            data = b''
-            with conn:
-                while True:
-                    d = conn.recv(1024)
-                    data += d
-                    if not d:
-                        break
-                    if d.endswith(EOT):
-                        data = data[:-1]
-                        break
-
-                # send to the main thread for execution
-                self.pipesig.emit()
-                self.i_pipe.put(data)
-
-                # from the main thread
-                conn.sendall(self.o_pipe.get())
-
-
-class Client:
-
-    def __init__(self, server_addr: tuple[str, int]):
-        self.server_addr = server_addr
-        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-
-    def com(self, exec: bytes | Callable[[Showcase, dict], Any] | object) -> dict:
-        """
-        Send an executable byte-string, object or function to the ``showcase``.
-
-        Strings are executed via ``exec``, the ``showcase`` object can be accessed
-        via the globals (`showcase` or `sc`). The response dict is created from the locals.
-
-        Objects and functions are called and receive the storefront object as the
-        first parameter and the response dict as the second parameter.
-
-        Returns the response dict.
-        """
-        with self.socket:
-            self.socket.connect(self.server_addr)
-            msg = "[??]"
-            if not isinstance(exec, bytes):
-                try:
-                    if (t := type(exec)) == FunctionType:
-                        msg = f"{marshal} (version={MARSHAL_VERSION})"
-                        exec = marshal.dumps(exec.__code__, MARSHAL_VERSION)
-                    else:
-                        msg = f"{pickle} (protocol={PICKLE_PROTOCOL})"
-                        exec = pickle.dumps(exec, PICKLE_PROTOCOL)
-                except Exception as e:
-                    print_exception(e)
-                    stderr.flush()
-                    print(f"\nThe above error occurred when picking {exec} which has the type {t}.\nObjects of type {t} are picked with {msg} for the transaction.\n", file=stderr)
-                    exit(1)
-            self.socket.sendall(exec + EOT)
-            exec = b""
-            while d := self.socket.recv(1024):
-                exec += d
-            if exec:
-                return pickle.loads(exec)
+            timeout = None
+            if self._deadlines:
+                timeout = max(0.0, self._deadlines[0][0] - monotonic())
+            for key, mask in self.selector.select(timeout):
+                key.data(key.fileobj, mask)
+            self._expire()
+
+    def _expire(self):
+        now = monotonic()
+        while self._deadlines and self._deadlines[0][0] <= now:
+            deadline, srid, timeout = heappop(self._deadlines)
+            conn, rid = self._pending.pop(srid, (None, 0))
+            if conn is None or conn.closed:
+                continue
+            conn.outstanding -= 1
+            self._send(conn, rid, pickle.dumps({"!": TimeoutError(f"the request exceeded its time limit of {timeout} s")}))
+            self._update(conn)
+
+    def _accept(self, sock: socket.socket, mask: int):
+        try:
+            conn, addr = sock.accept()
+        except (BlockingIOError, InterruptedError):
+            return
+        conn.setblocking(False)
+        self._update(_Connection(conn))
+
+    def _update(self, conn: _Connection):
+        events = (selectors.EVENT_READ if conn.reading else 0) | (selectors.EVENT_WRITE if conn.out else 0)
+        if events == conn.events:
+            return
+        if not conn.events:
+            self.selector.register(conn.sock, events, partial(self._serve, conn))
+        elif not events:
+            self.selector.unregister(conn.sock)
+        else:
+            self.selector.modify(conn.sock, events, partial(self._serve, conn))
+        conn.events = events
+
+    def _close(self, conn: _Connection):
+        if not conn.closed:
+            conn.closed = True
+            self._subscribed.discard(conn)
+            if conn.events:
+                self.selector.unregister(conn.sock)
+            conn.sock.close()
+
+    def _serve(self, conn: _Connection, sock: socket.socket, mask: int):
+        if mask & selectors.EVENT_READ:
+            self._read(conn)
+        if mask & selectors.EVENT_WRITE and not conn.closed:
+            self._write(conn)
+        if not conn.closed:
+            if not (conn.reading or conn.outstanding or conn.out):
+                self._close(conn)
             else:
-                return dict()
-
-    def com_back(self):
-        return self.com(b"sc.back()")
-
-    def com_forward(self):
-        return self.com(b"sc.forward()")
-
-    def com_reload(self):
-        return self.com(b"sc.reload()")
-
-    def com_home(self):
-        return self.com(b"sc.home()")
-
-    def com_load(
-            self,
-            url: str,
-            tab_index: int = None,
-            tab_append: bool = None,
-    ):
-        if tab_append:
-            return self.com(b"sc.tab_add(%r)" % url)
-        elif tab_index is not None:
-            return self.com(b"sc.tab_change(%d); sc.load(%r)" % (tab_index, url))
+                self._update(conn)
+
+    def _read(self, conn: _Connection):
+        try:
+            n = conn.recv()
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            return self._close(conn)
+        if not n:
+            conn.reading = False
+            if conn.version == 0 and conn.pending():
+                self._dispatch(conn, FRAME_EXEC, conn.take(conn.pending()))
+            return
+        if conn.version is None:
+            if conn.buf[conn.start] != HELLO[0]:
+                conn.version = 0
+            elif conn.pending() >= len(HELLO) + 1:
+                if conn.take(len(HELLO)) != HELLO or not (version := min(conn.take(1)[0], FRAME_VERSION)):
+                    return self._close(conn)
+                conn.version = version
+                conn.out += HELLO + bytes((version,))
+        if conn.version == 0:
+            if conn.buf[conn.end - 1] == EOT[0]:
+                conn.reading = False
+                self._dispatch(conn, FRAME_EXEC, conn.take(conn.pending() - 1))
+        elif conn.version:
+            try:
+                for kind, flags, rid, payload in conn.frames():
+                    timeout = None
+                    if flags & FLAG_DEADLINE:
+                        timeout, = DEADLINE.unpack_from(payload)
+                        payload = payload[DEADLINE.size:]
+                    if kind in (FRAME_EXEC, FRAME_BATCH, FRAME_CALL):
+                        self._dispatch(conn, kind, payload, rid, timeout)
+                    elif kind == FRAME_SUBSCRIBE:
+                        self._subscribe(conn, rid, payload)
+                    elif kind == FRAME_UNSUBSCRIBE:
+                        conn.subscriptions.pop(rid, None)
+                        if not conn.subscriptions:
+                            self._subscribed.discard(conn)
+                        self._send(conn, rid, pickle.dumps(dict()))
+                    else:
+                        self._send(conn, rid, pickle.dumps({"!": ValueError(f"unknown frame kind {kind}")}))
+            except (ValueError, struct.error):
+                self._close(conn)
+
+    def _subscribe(self, conn: _Connection, rid: int, payload: bytes):
+        res = dict()
+        try:
+            events, tabs, tab_ids = pickle.loads(payload)
+            if events is not None:
+                events = frozenset(events)
+                if unknown := events.difference(EVENTS):
+                    raise ValueError(f"unknown events: {', '.join(sorted(unknown))}")
+            if tabs is not None:
+                tabs = frozenset(tabs)
+            if tab_ids is not None:
+                tab_ids = frozenset(tab_ids)
+        except Exception as e:
+            res["!"] = e
         else:
-            return self.com(b"sc.load(%r)" % url)
+            conn.subscriptions[rid] = (events, tabs, tab_ids)
+            self._subscribed.add(conn)
+        self._send(conn, rid, pickle.dumps(res))
 
-    def com_stop_load(self):
-        return self.com(b"sc.stop_load()")
+    def _dispatch(self, conn: _Connection, kind: int, data: bytes, rid: int = 0, timeout: float = None):
+        srid = next(self._request_ids)
+        self._pending[srid] = (conn, rid)
+        conn.outstanding += 1
+        deadline = None
+        if timeout is not None:
+            deadline = monotonic() + timeout
+            heappush(self._deadlines, (deadline, srid, timeout))
+        self.i_pipe.put((srid, kind, data, deadline))
+        # send to the main thread for execution
+        self.pipesig.emit()
 
-    def com_quit(self):
-        return self.com(b"sc.quit()")
+    def _send(self, conn: _Connection, rid: int, data: bytes):
+        if conn.version:
+            conn.out += FRAME_HEADER.pack(FRAME_RESULT, 0, rid, len(data))
+        conn.out += data
 
-    def com_tab_change(self, index: int):
-        return self.com(b"sc.tab_change(%d)" % index)
+    def _wakeup(self, sock: socket.socket, mask: int):
+        try:
+            while sock.recv(4096):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+        self._replies()
+        self._publish()
 
-    def com_tab_close(self, index: int):
-        if index == -1:
-            index = b"None"
-        return self.com(b"sc.tab_close(%s)" % index)
+    def _replies(self):
+        while True:
+            try:
+                srid, data = self.o_pipe.get_nowait()
+            except Empty:
+                break
+            conn, rid = self._pending.pop(srid, (None, 0))
+            if conn is None or conn.closed:
+                continue
+            conn.outstanding -= 1
+            self._send(conn, rid, data)
+            self._update(conn)
 
-    def com_ping(self):
+    def _publish(self):
+        while True:
+            try:
+                event, tab, tab_id, data = self._events.get_nowait()
+            except Empty:
+                break
+            for conn in self._subscribed:
+                if len(conn.out) > EVENT_BACKLOG:
+                    continue
+                for rid, (events, tabs, tab_ids) in conn.subscriptions.items():
+                    if ((events is None or event in events)
+                            and (tabs is None or tab in tabs)
+                            and (tab_ids is None or tab_id in tab_ids)):
+                        conn.out += FRAME_HEADER.pack(FRAME_EVENT, 0, rid, len(data))
+                        conn.out += data
+                self._update(conn)
+
+    def _write(self, conn: _Connection):
         try:
-            return self.com(b"pong = 1")
-        except ConnectionError:
-            return False
+            with memoryview(conn.out) as view, view[conn.sent:] as rest:
+                n = conn.sock.send(rest)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            return self._close(conn)
+        conn.sent += n
+        if conn.sent == len(conn.out):
+            conn.out.clear()
+            conn.sent = 0
+
+
+@lru_cache(maxsize=CODE_CACHE_SIZE)
+def compile_source(data: bytes) -> CodeType:
+    return compile(data, "<communicator>", "exec")
+
+
+@lru_cache(maxsize=CODE_CACHE_SIZE)
+def load_code(data: bytes) -> CodeType:
+    return marshal.loads(data)
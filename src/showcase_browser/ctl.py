@@ -0,0 +1,140 @@
+try:
+    import sys
+    from pathlib import Path
+    sys.path.append(str(Path(__file__).parent))
+except Exception:
+    raise
+
+# this entry point must not import Qt (see benchmarks/importtime.py)
+
+import json
+from argparse import ArgumentParser, RawDescriptionHelpFormatter
+from ast import literal_eval
+
+from client import Client, COMMANDS
+
+
+parser = ArgumentParser(
+    prog="showcase-ctl",
+    formatter_class=RawDescriptionHelpFormatter,
+    description="Control a running showcase via the Communicator, without loading Qt. "
+                "The return value of the command is printed as JSON, the program exits "
+                "with code 1 if the command failed.",
+    epilog="examples:\n"
+           "  showcase-ctl reload\n"
+           "  showcase-ctl load example.com --tab-id 3\n"
+           "  showcase-ctl call tab_add example.com\n"
+           "  showcase-ctl exec \"sc.window.setWindowTitle('x')\"",
+)
+parser.add_argument(
+    "--host",
+    action="store",
+    default="127.0.0.3",
+    metavar="xxx.xxx.xxx.xxx",
+)
+parser.add_argument(
+    "--port",
+    action="store",
+    default=51_001,
+    metavar="port-number",
+    type=int,
+)
+parser.add_argument(
+    "--unix",
+    action="store",
+    help="Connect to the unix domain socket at <path> (a leading `@' refers to the abstract namespace).",
+    metavar="<path>",
+)
+parser.add_argument(
+    "-t", "--timeout",
+    action="store",
+    help="Time limit of the command in seconds.",
+    metavar="s",
+    type=float,
+)
+
+commands = parser.add_subparsers(dest="command", metavar="<command>", required=True)
+for name in ("back", "forward", "reload", "home", "stop_load", "quit", "tab_list", "blocklist_hits", "window_list"):
+    commands.add_parser(name, help=f"Send `{name}'.")
+
+_ping = commands.add_parser("ping", help="Exit with code 0 if the showcase is reachable.")
+
+_load = commands.add_parser("load", help="Load the url in the current tab, tab `--tab-index', `--tab-id' or a new tab.")
+_load.add_argument("url")
+_load_target = _load.add_mutually_exclusive_group()
+_load_target.add_argument("--tab-index", type=int, metavar="n")
+_load_target.add_argument("--tab-id", type=int, metavar="id")
+_load_target.add_argument("--append", action="store_true", help="Add a new tab.")
+
+for name in ("tab_change", "tab_close", "tab_info", "timings"):
+    _tab = commands.add_parser(name, help=f"Send `{name}' for the current tab, tab `--tab-index' or `--tab-id'.")
+    _tab_target = _tab.add_mutually_exclusive_group()
+    _tab_target.add_argument("--tab-index", type=int, metavar="n")
+    _tab_target.add_argument("--tab-id", type=int, metavar="id")
+
+_exec = commands.add_parser("exec", help="Execute python source in the showcase (`sc' is the showcase, `res' the response dict).")
+_exec.add_argument("source")
+
+_call = commands.add_parser(
+    "call",
+    help="Call a named command, the arguments are python literals (or strings otherwise), "
+         "keyword arguments are given as key=value.",
+)
+_call.add_argument("name", choices=COMMANDS, metavar="<name>")
+_call.add_argument("args", nargs="*")
+
+
+def _literal(arg: str):
+    try:
+        return literal_eval(arg)
+    except (ValueError, SyntaxError):
+        return arg
+
+
+def _call_args(raw: list[str]) -> tuple[list, dict]:
+    args = list()
+    kwargs = dict()
+    for arg in raw:
+        key, sep, val = arg.partition("=")
+        if sep and key.isidentifier():
+            kwargs[key] = _literal(val)
+        else:
+            args.append(_literal(arg))
+    return args, kwargs
+
+
+def request(client: Client, args) -> dict:
+    if args.command == "exec":
+        return client.com(args.source.encode(), args.timeout)
+    if args.command == "call":
+        call_args, call_kwargs = _call_args(args.args)
+        return client.com_call(args.name, *call_args, timeout=args.timeout, **call_kwargs)
+    if args.command == "load":
+        if args.append:
+            return client.com_call("tab_add", args.url, timeout=args.timeout)
+        if args.tab_index is not None or args.tab_id is not None:
+            return client.com_call("tab_load", args.url, args.tab_index, args.tab_id, timeout=args.timeout)
+        return client.com_call("load", args.url, timeout=args.timeout)
+    if hasattr(args, "tab_id"):
+        return client.com_call(args.command, args.tab_index, args.tab_id, timeout=args.timeout)
+    return client.com_call(args.command, timeout=args.timeout)
+
+
+def run(argv: list[str] = None):
+    args = parser.parse_args(argv)
+    client = Client(args.unix or (args.host, args.port), timeout=args.timeout)
+    if args.command == "ping":
+        exit(0 if client.com_ping() else 1)
+    try:
+        res = request(client, args)
+    except (ConnectionError, FileNotFoundError, TimeoutError) as e:
+        print(f"showcase-ctl: {e}", file=sys.stderr)
+        exit(2)
+    if "!" in res:
+        print(f"showcase-ctl: {res['!']!r}", file=sys.stderr)
+        exit(1)
+    print(json.dumps(res.get("return", res), default=repr))
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from time import time
+
+from PyQt6.QtCore import QObject, QTimer
+from PyQt6.QtWebEngineCore import QWebEnginePage
+from PyQt6.QtWebEngineWidgets import QWebEngineView
+from PyQt6.QtWidgets import QTabWidget
+
+import tabregistry
+
+
+Active = QWebEnginePage.LifecycleState.Active
+Frozen = QWebEnginePage.LifecycleState.Frozen
+Discarded = QWebEnginePage.LifecycleState.Discarded
+
+
+def process_rss(pid: int) -> int | None:
+    """Resident set size of process `pid` in bytes (None if it cannot be determined)."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    try:
+        return psutil.Process(pid).memory_info().rss
+    except psutil.Error:
+        return None
+
+
+class Hibernation(QObject):
+    """
+    Moves the pages of inactive tabs to the lifecycle states ``Frozen`` and
+    ``Discarded``.
+
+    A tab is inactive since it was last left (``TabInfo.last_active`` of
+    `registry`). Its page is frozen after
+    `freeze_after` and discarded after `discard_after` seconds. If the
+    renderer processes of the tabs use more than `memory_budget` bytes in
+    total, the page of the least recently used tab is discarded at each check
+    until the budget is met. Discarded pages are reloaded when their tab is
+    focused again.
+    """
+
+    def __init__(
+            self,
+            tabs: QTabWidget,
+            registry: tabregistry.TabRegistry,
+            freeze_after: float = None,
+            discard_after: float = None,
+            memory_budget: int = None,
+            interval: float = 5.0,
+    ):
+        QObject.__init__(self, tabs)
+        self.tabs = tabs
+        self.registry = registry
+        self.freeze_after = freeze_after
+        self.discard_after = discard_after
+        self.memory_budget = memory_budget
+
+        tabs.currentChanged.connect(self.activated)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.check)
+        self.timer.start(int(interval * 1000))
+
+    def activated(self, index: int):
+        if isinstance(view := self.tabs.widget(index), QWebEngineView):
+            if view.page().lifecycleState() != Active:
+                view.page().setLifecycleState(Active)
+
+    def last_active(self, view: QWebEngineView, now: float) -> float:
+        if (info := self.registry.of(view)) is None:
+            return now
+        if info.last_active is None:
+            info.last_active = now
+        return info.last_active
+
+    def inactive(self) -> list[QWebEngineView]:
+        """The browsers of the background tabs, least recently used first."""
+        now = time()
+        current = self.tabs.currentWidget()
+        views = list()
+        for i in range(self.tabs.count()):
+            if isinstance(view := self.tabs.widget(i), QWebEngineView) and view is not current:
+                views.append(view)
+        views.sort(key=lambda view: self.last_active(view, now))
+        return views
+
+    def memory_usage(self) -> int | None:
+        pids = {view.page().renderProcessPid()
+                for view in map(self.tabs.widget, range(self.tabs.count()))
+                if isinstance(view, QWebEngineView)}
+        usage = 0
+        for pid in pids:
+            if pid > 0:
+                if (rss := process_rss(pid)) is None:
+                    return None
+                usage += rss
+        return usage
+
+    def check(self):
+        now = time()
+        views = self.inactive()
+        for view in views:
+            page = view.page()
+            idle = now - self.last_active(view, now)
+            if self.discard_after is not None and idle >= self.discard_after:
+                if page.lifecycleState() != Discarded:
+                    page.setLifecycleState(Discarded)
+            elif self.freeze_after is not None and idle >= self.freeze_after:
+                if page.lifecycleState() == Active:
+                    page.setLifecycleState(Frozen)
+        if self.memory_budget and (usage := self.memory_usage()) is not None and usage > self.memory_budget:
+            for view in views:
+                if view.page().lifecycleState() != Discarded:
+                    view.page().setLifecycleState(Discarded)
+                    break
@@ -5,32 +5,62 @@ try:
 except Exception:
     raise
 
-from args import __args__, Null
-from showcase import Showcase
-from communicate import Client
-from __init__ import __version__
-import webpolicies
-import versions
+import startup
+
+# `showcase render ...' has its own parameterization
+RENDER = sys.argv[1:2] == ["render"]
+
+# Qt (and the web engine) is only imported when a showcase is started or when needed for a message
+if not RENDER:
+    with startup.span("import args"):
+        from args import __args__, Null, window_parser
+    import errno
+    from shlex import split
+    with startup.span("import client"):
+        from client import Client, format_address
+    from __init__ import __version__
+
+
+def handoff(com_address, urls: list[str], timeout: float = 5.0):
+    """
+    Hand `urls` over to the showcase at `com_address` and exit, return if
+    none is running there (see ``--single-instance``).
+    """
+    try:
+        res = Client(com_address, timeout=timeout).com_handoff(urls)
+    except (ConnectionRefusedError, FileNotFoundError):
+        return
+    except TimeoutError:
+        exit(f"[!]  The showcase at {format_address(com_address)} does not respond.")
+    exit(1 if "!" in res else 0)
 
 
 def run():
 
+    if RENDER:
+        import render
+        exit(render.run(sys.argv[2:]))
+
     if __args__.version:
         exit(__version__)
     if __args__.versions:
+        import versions
         exit(versions.get_available_msg())
     if __args__.policies_help:
+        import webpolicies
         exit(print(webpolicies.about()))
-
-    if not __args__.skip_upgrades and (v := versions.check_msg()):
-        print(v, flush=True)
+    if __args__.window_open_help:
+        exit(window_parser.print_help())
 
     if len(__args__.url) == 1:
         url = __args__.url[0]
     else:
         url = __args__.url
 
-    com_address = (__args__.com_host or "127.0.0.3", __args__.com_port or 51_001)
+    com_address = __args__.com_unix or (__args__.com_host or "127.0.0.3", __args__.com_port or 51_001)
+
+    if __args__.single_instance:
+        handoff(com_address, list(__args__.url))
 
     if __args__.com_exec:
         exit(Client(com_address).com(str(" ").join(__args__.url).encode()))
@@ -53,53 +83,91 @@ def run():
     elif __args__.com_try:
         try:
             exit(Client(com_address).com_load(url, __args__.com_tab_index, __args__.com_tab_append))
-        except ConnectionRefusedError:
+        except (ConnectionRefusedError, FileNotFoundError):
             pass
     elif __args__.com_ping:
         exit(not Client(com_address).com_ping())
 
-    if __args__.com or __args__.com_try:
-        print(f"\n"
-              f"[*]  Serving Communicator at {com_address[0]}:{com_address[1]}\n")
-    else:
+    with startup.span("import showcase"):
+        import versions
+        from showcase import Showcase
+
+    if not __args__.skip_upgrades:
+        versions.check_background()
+
+    if not (__args__.com or __args__.com_try or __args__.single_instance):
         com_address = None
 
-    showcase = Showcase(
-        url or '',
-        __args__.wg_url,
-        __args__.ks_url,
-        __args__.wg_back,
-        __args__.ks_back,
-        __args__.wg_forward,
-        __args__.ks_forward,
-        __args__.wg_refresh,
-        __args__.ks_refresh,
-        __args__.wg_home,
-        __args__.ks_home,
-        __args__.home_url,
-        __args__.wg_stop,
-        __args__.ks_stop,
-        __args__.wg_tabs,
-        __args__.wg_tabs_close,
-        __args__.ks_tabs_close,
-        __args__.wg_tabs_add,
-        __args__.ks_tabs_add,
-        __args__.tabs_default_url,
-        __args__.tabs_default_label,
-        __args__.tabs_dynamic_labels,
-        __args__.tabs_keep_last,
-        __args__.window_title,
-        __args__.window_icon,
-        __args__.window_maxsize,
-        com_address,
-        __args__.link_target,
-        __args__.javascript,
-        __args__.no_scrollbars,
-        __args__.scroll_animator,
-        {name: True for name in __args__.policies_set or ()}
-        | {name: False for name in __args__.policies_unset or ()}
-    )
+    try:
+        showcase = Showcase(
+            url or '',
+            __args__.wg_url,
+            __args__.ks_url,
+            __args__.wg_back,
+            __args__.ks_back,
+            __args__.wg_forward,
+            __args__.ks_forward,
+            __args__.wg_refresh,
+            __args__.ks_refresh,
+            __args__.wg_home,
+            __args__.ks_home,
+            __args__.home_url,
+            __args__.wg_stop,
+            __args__.ks_stop,
+            __args__.wg_tabs,
+            __args__.wg_tabs_close,
+            __args__.ks_tabs_close,
+            __args__.wg_tabs_add,
+            __args__.ks_tabs_add,
+            __args__.tabs_default_url,
+            __args__.tabs_default_label,
+            __args__.tabs_dynamic_labels,
+            __args__.tabs_keep_last,
+            __args__.window_title,
+            __args__.window_icon,
+            __args__.window_maxsize,
+            com_address,
+            __args__.link_target,
+            __args__.javascript,
+            __args__.no_scrollbars,
+            __args__.scroll_animator,
+            {name: True for name in __args__.policies_set or ()}
+            | {name: False for name in __args__.policies_unset or ()},
+            __args__.tabs_lazy,
+            __args__.tabs_preload,
+            __args__.tabs_freeze_after,
+            __args__.tabs_discard_after,
+            (__args__.tabs_memory_budget or 0) * 1024 * 1024,
+            __args__.profile_dir,
+            __args__.http_cache_dir,
+            (__args__.http_cache_size or 0) * 1024 * 1024,
+            __args__.http_cache_type,
+            __args__.tabs_pool_size,
+            __args__.telemetry_size,
+            __args__.telemetry_log,
+            __args__.blocklist,
+            __args__.package,
+            None if __args__.window_screen is Null else __args__.window_screen,
+            [vars(window_parser.parse_args(split(spec))) for spec in __args__.window_open or ()],
+            __args__.trace_startup,
+            __args__.trace_startup_chrome,
+        )
+    except OSError as e:
+        # another instance started at the same time and serves the communicator,
+        # the socket is bound before the window is built
+        if not __args__.single_instance or e.errno != errno.EADDRINUSE:
+            raise
+        handoff(com_address, list(__args__.url), 15.0)
+        raise
+
+    if com_address:
+        print(f"\n"
+              f"[*]  Serving Communicator at {format_address(com_address)}\n")
 
+    startup.mark("event loop")
+    if not (__args__.trace_startup or __args__.trace_startup_chrome):
+        # otherwise recorded up to the first paint
+        startup.stop()
     showcase.exec()
 
 
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import mimetypes
+import mmap
+import struct
+import zipfile
+import zlib
+from functools import lru_cache
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO
+
+from PyQt6.QtCore import QByteArray, QFile, QIODevice, QObject
+from PyQt6.QtWebEngineCore import QWebEngineUrlRequestJob, QWebEngineUrlScheme, QWebEngineUrlSchemeHandler
+
+
+SCHEME = b"showcase-pkg"
+INDEX = "index.html"
+# chunk size for reading compressed members of archives
+CHUNK_SIZE = 65536
+
+# local file header of a zip member (signature ... file name length, extra field length)
+_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+
+
+def register():
+    """Register the scheme, must be called before the application is created."""
+    if QWebEngineUrlScheme.schemeByName(QByteArray(SCHEME)).name() == QByteArray(SCHEME):
+        return
+    scheme = QWebEngineUrlScheme(QByteArray(SCHEME))
+    scheme.setSyntax(QWebEngineUrlScheme.Syntax.Host)
+    scheme.setFlags(
+        QWebEngineUrlScheme.Flag.SecureScheme
+        | QWebEngineUrlScheme.Flag.LocalAccessAllowed
+        | QWebEngineUrlScheme.Flag.CorsEnabled
+    )
+    QWebEngineUrlScheme.registerScheme(scheme)
+
+
+@lru_cache(maxsize=None)
+def mime_type(suffix: str) -> bytes:
+    return (mimetypes.types_map.get(suffix.lower()) or "application/octet-stream").encode()
+
+
+def parse_package(spec: str) -> tuple[str, str]:
+    """Split ``[name=]<path>`` into name and path, the name defaults to the stem of the path."""
+    name, sep, path = spec.partition("=")
+    if not sep:
+        path = spec
+        name = Path(spec).stem
+    return name.lower(), path
+
+
+class _StreamDevice(QIODevice):
+    """
+    Read-only sequential device over a binary stream, which is read chunk by
+    chunk. The next chunk is read ahead, so that ``atEnd`` and
+    ``bytesAvailable`` report the end of the stream.
+    """
+
+    def __init__(self, stream: BinaryIO, parent: QObject = None):
+        QIODevice.__init__(self, parent)
+        self.stream = stream
+        self._chunk = b""
+        self._eof = False
+        self.open(QIODevice.OpenModeFlag.ReadOnly)
+
+    def _read_ahead(self):
+        if not self._chunk and not self._eof:
+            self._chunk = self.stream.read(CHUNK_SIZE)
+            self._eof = not self._chunk
+
+    def isSequential(self) -> bool:
+        return True
+
+    def bytesAvailable(self) -> int:
+        self._read_ahead()
+        return len(self._chunk) + QIODevice.bytesAvailable(self)
+
+    def atEnd(self) -> bool:
+        return self.bytesAvailable() == 0
+
+    def readData(self, maxlen: int) -> bytes:
+        self._read_ahead()
+        data, self._chunk = self._chunk[:maxlen], self._chunk[maxlen:]
+        return data
+
+    def writeData(self, data) -> int:
+        return -1
+
+    def close(self):
+        self.stream.close()
+        QIODevice.close(self)
+
+
+class _ZipMember:
+    """Stream of a stored or deflated member from the memory map of an archive."""
+
+    def __init__(self, data: memoryview, deflated: bool):
+        self.data = data
+        self.pos = 0
+        self.inflate = zlib.decompressobj(-zlib.MAX_WBITS) if deflated else None
+
+    def read(self, n: int) -> bytes:
+        if self.inflate is None:
+            chunk = self.data[self.pos:self.pos + n]
+            self.pos += len(chunk)
+            return bytes(chunk)
+        while True:
+            if self.inflate.unconsumed_tail:
+                out = self.inflate.decompress(self.inflate.unconsumed_tail, n)
+            elif self.pos < len(self.data):
+                chunk = self.data[self.pos:self.pos + CHUNK_SIZE]
+                self.pos += len(chunk)
+                out = self.inflate.decompress(chunk, n)
+            else:
+                return self.inflate.flush()
+            if out:
+                return out
+
+    def close(self):
+        self.data.release()
+
+
+class Package:
+    """A site in a directory or zip archive."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.zip: zipfile.ZipFile | None = None
+        if self.path.is_file():
+            self.zip = zipfile.ZipFile(self.path)
+            with open(self.path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.members = {info.filename: info for info in self.zip.infolist() if not info.is_dir()}
+        elif not self.path.is_dir():
+            raise FileNotFoundError(f"package not found: {path}")
+        else:
+            self.path = self.path.resolve()
+
+    def open(self, path: str, parent: QObject) -> tuple[bytes, QIODevice] | None:
+        """Open the file `path` of the package, returns its mime type and a device, or None."""
+        parts = [p for p in PurePosixPath("/", path).parts[1:] if p != "."]
+        if ".." in parts:
+            return None
+        if self.zip is not None:
+            name = "/".join(parts)
+            if (info := self.members.get(name)) is None:
+                if (info := self.members.get(f"{name}/{INDEX}".lstrip("/"))) is None:
+                    return None
+            return mime_type(PurePosixPath(info.filename).suffix), _StreamDevice(self._member(info), parent)
+        file = self.path.joinpath(*parts)
+        if file.is_dir():
+            file /= INDEX
+        if not file.is_file():
+            return None
+        device = QFile(str(file), parent)
+        if not device.open(QIODevice.OpenModeFlag.ReadOnly):
+            return None
+        return mime_type(file.suffix), device
+
+    def _member(self, info: zipfile.ZipInfo) -> BinaryIO | _ZipMember:
+        if info.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED) or info.flag_bits & 0x1:
+            return self.zip.open(info)
+        header = _LOCAL_HEADER.unpack_from(self._map, info.header_offset)
+        start = info.header_offset + _LOCAL_HEADER.size + header[-2] + header[-1]
+        data = memoryview(self._map)[start:start + info.compress_size]
+        return _ZipMember(data, info.compress_type == zipfile.ZIP_DEFLATED)
+
+
+class PackageSchemeHandler(QWebEngineUrlSchemeHandler):
+    """
+    Serves ``showcase-pkg://<name>/<path>`` from the packages, which are
+    directories or zip archives.
+    """
+
+    def __init__(self, packages: dict[str, Package], parent: QObject = None):
+        QWebEngineUrlSchemeHandler.__init__(self, parent)
+        self.packages = packages
+
+    def requestStarted(self, job: QWebEngineUrlRequestJob):
+        url = job.requestUrl()
+        if (package := self.packages.get(url.host())) is None:
+            job.fail(QWebEngineUrlRequestJob.Error.UrlNotFound)
+            return
+        try:
+            res = package.open(url.path(), job)
+        except (OSError, RuntimeError, zipfile.BadZipFile):
+            # RuntimeError: encrypted members of archives
+            job.fail(QWebEngineUrlRequestJob.Error.RequestFailed)
+            return
+        if res is None:
+            job.fail(QWebEngineUrlRequestJob.Error.UrlNotFound)
+            return
+        job.reply(*res)
@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+from argparse import ArgumentParser, ArgumentTypeError, RawDescriptionHelpFormatter
+from collections import deque
+from pathlib import Path
+from time import monotonic, time
+
+from PyQt6.QtCore import QObject, QTimer, QUrl, Qt
+from PyQt6.QtWebEngineCore import QWebEngineProfile
+from PyQt6.QtWebEngineWidgets import QWebEngineView
+from PyQt6.QtWidgets import QApplication
+
+import webpolicies
+
+
+def _size(arg: str) -> tuple[int, int]:
+    width, sep, height = arg.partition("x")
+    try:
+        if not sep or int(width) <= 0 or int(height) <= 0:
+            raise ValueError
+    except ValueError:
+        raise ArgumentTypeError(f"invalid size {arg!r}, expected <width>x<height> in pixels") from None
+    return int(width), int(height)
+
+
+parser = ArgumentParser(
+    prog="showcase render",
+    formatter_class=RawDescriptionHelpFormatter,
+    description="Render pages headless (offscreen platform) to PNG and/or PDF files. "
+                "The results are listed in the manifest `manifest.json' of the output directory.",
+)
+parser.add_argument(
+    "url",
+    action="store",
+    help="The urls to render.",
+    nargs="*",
+)
+parser.add_argument(
+    "-i", "--input",
+    action="store",
+    help="Read further urls from this file, one per line "
+         "(empty lines and lines beginning with `#' are skipped).",
+    metavar="<file>",
+)
+parser.add_argument(
+    "-o", "--out",
+    action="store",
+    default=".",
+    help="The output directory (default: the current directory).",
+    metavar="<dir>",
+)
+parser.add_argument(
+    "--png",
+    action="store_true",
+    help="Save a screenshot of the view (default if `--pdf' is not given).",
+)
+parser.add_argument(
+    "--pdf",
+    action="store_true",
+    help="Print the page to PDF.",
+)
+parser.add_argument(
+    "-w", "--workers",
+    action="store",
+    default=4,
+    help="Number of pages rendering concurrently (default 4).",
+    metavar="n",
+    type=int,
+)
+parser.add_argument(
+    "-t", "--timeout",
+    action="store",
+    default=30.0,
+    help="Time limit of a job in seconds (default 30).",
+    metavar="s",
+    type=float,
+)
+parser.add_argument(
+    "--size",
+    action="store",
+    default=(1280, 800),
+    help="Size of the view in pixels (default 1280x800).",
+    metavar="<width>x<height>",
+    type=_size,
+)
+parser.add_argument(
+    "--settle",
+    action="store",
+    default=0.0,
+    help="Wait `s' seconds after the page is loaded before it is rendered "
+         "(e.g. for animations or scripts that load data).",
+    metavar="s",
+    type=float,
+)
+parser.add_argument(
+    "--javascript",
+    action="store_true",
+    help="Set all available Javascript policies to True.",
+)
+parser.add_argument(
+    "--no-scrollbars",
+    action="store_true",
+    help="Do not generate scrollbars (ShowScrollBars policy).",
+)
+parser.add_argument(
+    "--policies-set",
+    action="store",
+    choices=webpolicies.MAP,
+    metavar="<policy>",
+    nargs="+",
+    help="Enable the named policies.",
+)
+parser.add_argument(
+    "--policies-unset",
+    action="store",
+    choices=webpolicies.MAP,
+    metavar="<policy>",
+    nargs="+",
+    help="Disable the named policies.",
+)
+
+
+def _slug(url: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", url.split("://", 1)[-1]).strip("_")[:80] or "page"
+
+
+class Job:
+
+    def __init__(self, index: int, url: str, out: Path):
+        self.index = index
+        self.url = url
+        self.stem = out / f"{index:04d}-{_slug(url)}"
+        self.result = dict(url=url, ok=False, error=None, png=None, pdf=None, started=None, duration=None)
+
+
+class _Worker:
+    """
+    A page that renders the jobs one after the other, ``generation`` identifies
+    the current job. ``loading`` is set while the load of the job is pending,
+    ``stale`` counts the pending loads of finished jobs, whose ``loadFinished``
+    is ignored.
+    """
+
+    def __init__(self, view: QWebEngineView):
+        self.view = view
+        self.job: Job | None = None
+        self.generation = 0
+        self.started = 0.0
+        self.loading = False
+        self.stale = 0
+
+
+class Renderer(QObject):
+    """
+    Renders the jobs with a pool of `workers` views which are reused between
+    the jobs. A job fails if it is not finished within `timeout` seconds.
+    """
+
+    def __init__(
+            self,
+            profile: QWebEngineProfile,
+            jobs: list[Job],
+            workers: int = 4,
+            timeout: float = 30.0,
+            size: tuple[int, int] = (1280, 800),
+            settle: float = 0.0,
+            png: bool = True,
+            pdf: bool = False,
+    ):
+        QObject.__init__(self)
+        self.jobs = deque(jobs)
+        self.results: list[dict] = [job.result for job in jobs]
+        self.timeout = timeout
+        self.settle = settle
+        self.png = png
+        self.pdf = pdf
+        self.workers: list[_Worker] = list()
+        for _ in range(max(1, min(workers, len(jobs)))):
+            view = QWebEngineView(profile)
+            view.setAttribute(Qt.WidgetAttribute.WA_DontShowOnScreen)
+            view.resize(*size)
+            view.show()
+            worker = _Worker(view)
+            view.loadFinished.connect(lambda ok, w=worker: self._loaded(w, ok))
+            view.page().pdfPrintingFinished.connect(lambda path, ok, w=worker: self._printed(w, path, ok))
+            self.workers.append(worker)
+
+    def start(self):
+        for worker in self.workers:
+            self._next(worker)
+
+    def _next(self, worker: _Worker):
+        if not self.jobs:
+            if not any(w.job for w in self.workers):
+                QApplication.quit()
+            return
+        job = worker.job = self.jobs.popleft()
+        generation = worker.generation
+        worker.started = monotonic()
+        job.result["started"] = time()
+        QTimer.singleShot(int(self.timeout * 1000), lambda: self._timeout(worker, generation))
+        url = QUrl(job.url)
+        if url.scheme() == "":
+            url.setScheme("https")
+        worker.loading = True
+        worker.view.load(url)
+
+    def _finish(self, worker: _Worker, error: str | None = None):
+        worker.job.result.update(ok=error is None, error=error, duration=monotonic() - worker.started)
+        worker.job = None
+        worker.generation += 1
+        if worker.loading:
+            worker.loading = False
+            worker.stale += 1
+        # the next job starts from the event loop, not within a signal of this one
+        QTimer.singleShot(0, lambda: self._next(worker))
+
+    def _timeout(self, worker: _Worker, generation: int):
+        if worker.generation == generation:
+            # finished first, the stop may emit loadFinished of the job immediately
+            self._finish(worker, "timeout")
+            worker.view.stop()
+
+    def _loaded(self, worker: _Worker, ok: bool):
+        if worker.stale:
+            worker.stale -= 1
+            return
+        if worker.job is None or not worker.loading:
+            return
+        worker.loading = False
+        if not ok:
+            self._finish(worker, "load failed")
+        elif self.settle:
+            generation = worker.generation
+            QTimer.singleShot(int(self.settle * 1000), lambda: self._render(worker, generation))
+        else:
+            self._render(worker, worker.generation)
+
+    def _render(self, worker: _Worker, generation: int):
+        if worker.generation != generation:
+            return
+        job = worker.job
+        if self.png:
+            path = str(job.stem) + ".png"
+            if not worker.view.grab().save(path):
+                return self._finish(worker, "png failed")
+            job.result["png"] = path
+        if self.pdf:
+            job.result["pdf"] = str(job.stem) + ".pdf"
+            worker.view.page().printToPdf(job.result["pdf"])
+        else:
+            self._finish(worker)
+
+    def _printed(self, worker: _Worker, path: str, ok: bool):
+        # the file names identify the jobs, a print of a finished job may still end
+        if worker.job is None or path != worker.job.result["pdf"]:
+            return
+        self._finish(worker, None if ok else "pdf failed")
+
+
+def read_urls(args) -> list[str]:
+    urls = list(args.url)
+    if args.input:
+        with open(args.input) as f:
+            urls.extend(line.strip() for line in f if line.strip() and not line.lstrip().startswith("#"))
+    return urls
+
+
+def run(argv: list[str]) -> int:
+    """Run the render mode with the command line arguments `argv`, returns the exit code."""
+    args = parser.parse_args(argv)
+    urls = read_urls(args)
+    if not urls:
+        parser.error("no urls given")
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QApplication(["showcase render"])
+    profile = QWebEngineProfile.defaultProfile()
+    webpolicies.apply(
+        profile.settings(),
+        webpolicies.resolve(
+            args.javascript,
+            args.no_scrollbars,
+            False,
+            {name: True for name in args.policies_set or ()}
+            | {name: False for name in args.policies_unset or ()},
+        ),
+    )
+
+    renderer = Renderer(
+        profile,
+        [Job(i, url, out) for i, url in enumerate(urls)],
+        args.workers,
+        args.timeout,
+        args.size,
+        args.settle,
+        args.png or not args.pdf,
+        args.pdf,
+    )
+    QTimer.singleShot(0, renderer.start)
+    app.exec()
+
+    with open(out / "manifest.json", "w") as f:
+        json.dump(renderer.results, f, indent=2)
+    failed = sum(not r["ok"] for r in renderer.results)
+    print(f"[*]  {len(urls) - failed} of {len(urls)} rendered, manifest: {out / 'manifest.json'}")
+    return 1 if failed else 0
@@ -2,21 +2,30 @@ from __future__ import annotations
 
 import marshal
 import pickle
+from concurrent.futures import Future, CancelledError
+from itertools import count
 from pathlib import Path
 from queue import Queue
 from sys import argv, stderr
+from time import monotonic, time
 from traceback import print_exception
 from types import FunctionType
-from typing import Callable, Literal
+from typing import Callable, Iterator, Literal
 from webbrowser import open_new_tab
 
-from PyQt6.QtCore import QUrl, QThread
+from PyQt6.QtCore import QObject, QUrl, QThread, QTimer, Qt, pyqtBoundSignal
 from PyQt6.QtGui import QAction, QIcon, QKeySequence, QShortcut
 from PyQt6.QtWebEngineWidgets import QWebEngineView
-from PyQt6.QtWebEngineCore import QWebEngineSettings, QWebEnginePage
-from PyQt6.QtWidgets import QMainWindow, QToolBar, QLineEdit, QApplication, QTabWidget, QToolButton
+from PyQt6.QtWebEngineCore import QWebEnginePage, QWebEngineProfile, QWebEngineScript
+from PyQt6.QtWidgets import QMainWindow, QToolBar, QLineEdit, QApplication, QTabWidget, QToolButton, QWidget
 
 import communicate
+import blocklist
+import hibernation
+import packages
+import startup
+import tabregistry
+import telemetry
 import webpolicies
 
 # qt.qpa.plugin: From 6.5.0, xcb-cursor0 or libxcb-cursor0 is needed to load the Qt xcb platform plugin.
@@ -40,7 +49,7 @@ _proj_root = str(Path(__file__).parent)
 class _IsolatedPage(QWebEnginePage):
 
     def createWindow(self, type):
-        page = _IsolatedPage(self.parent())
+        page = _IsolatedPage(self.profile(), self.parent())
 
         def url_change(url):
             _page = self.sender()
@@ -58,7 +67,7 @@ class _RejectPage(QWebEnginePage):
         ...
 
     def createWindow(self, type):
-        page = _RejectPage(self.parent())
+        page = _RejectPage(self.profile(), self.parent())
         return page
 
     def acceptNavigationRequest(self, url, type, isMainFrame):
@@ -69,16 +78,194 @@ class _RejectPage(QWebEnginePage):
             return super().acceptNavigationRequest(url, type, isMainFrame)
 
 
+class _TabPlaceholder(QWidget):
+    """Tab content until the first activation, the browser is created then."""
+
+    def __init__(self, url: str):
+        QWidget.__init__(self)
+        self.url = url
+
+
+class _BrowserPool(QObject):
+    """
+    Pre-built and configured blank browsers for new tabs.
+
+    The pool is (re)filled with one browser per pass of the idle event loop.
+    """
+
+    def __init__(self, factory: Callable[[], QWebEngineView], size: int):
+        QObject.__init__(self)
+        self.factory = factory
+        self.size = size
+        self.browsers: list[QWebEngineView] = list()
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._fill)
+        self._timer.start()
+
+    def _fill(self):
+        if len(self.browsers) < self.size:
+            self.browsers.append(self.factory())
+        else:
+            self._timer.stop()
+
+    def take(self) -> QWebEngineView:
+        if not self._timer.isActive():
+            self._timer.start()
+        if self.browsers:
+            return self.browsers.pop(0)
+        return self.factory()
+
+
+class _Window(QMainWindow):
+    """
+    Additional window of the showcase with its own browser (or tabs, if several
+    urls are given) and toolbar, the browsers share the profile of the showcase.
+    """
+
+    # toolbar elements: icon, label, slot
+    ACTIONS = {
+        "back": ("back.png", "Back", lambda w: w.browser().back()),
+        "forward": ("forward.png", "Forward", lambda w: w.browser().forward()),
+        "refresh": ("refresh.png", "Refresh", lambda w: w.browser().reload()),
+        "home": ("home.png", "Home", lambda w: w.app.home_url and w.load(w.app.home_url)),
+        "stop": ("stop.png", "Stop", lambda w: w.browser().stop()),
+    }
+    TOOLBAR = tuple(ACTIONS) + ("url",)
+
+    def __init__(
+            self,
+            app: Showcase,
+            window_id: int,
+            urls: list[str],
+            toolbar: tuple[str, ...] = (),
+            title: str = None,
+            screen: int = None,
+            maximize: bool = True,
+            fullscreen: bool = False,
+    ):
+        QMainWindow.__init__(self)
+        self.app = app
+        self.id = window_id
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        self.setWindowTitle(title or app.applicationName())
+
+        if len(urls) > 1:
+            tabs = QTabWidget()
+            tabs.setDocumentMode(True)
+            for url in urls:
+                browser = self._make_browser(url)
+                browser.titleChanged.connect(lambda t, b=browser: tabs.setTabText(tabs.indexOf(b), t))
+                tabs.addTab(browser, url)
+            tabs.currentChanged.connect(lambda _: self._set_urlbar())
+            self.browser = tabs.currentWidget
+            self.setCentralWidget(tabs)
+        else:
+            browser = self._make_browser(urls[0] if urls else "")
+            self.browser = lambda: browser
+            self.setCentralWidget(browser)
+
+        self.wg_url = QLineEdit()
+        if toolbar:
+            bar = QToolBar()
+            for name in toolbar:
+                if name == "url":
+                    self.wg_url.returnPressed.connect(lambda: self.load(self.wg_url.text()))
+                    bar.addWidget(self.wg_url)
+                else:
+                    icon, label, slot = self.ACTIONS[name]
+                    action = QAction(QIcon(_proj_root + '/things/' + icon), label, self)
+                    action.triggered.connect(lambda _, s=slot: s(self))
+                    bar.addAction(action)
+            self.addToolBar(bar)
+
+        screens = QApplication.screens()
+        if screen is not None and 0 <= screen < len(screens):
+            self.setScreen(screens[screen])
+            self.move(screens[screen].availableGeometry().topLeft())
+        if fullscreen:
+            self.showFullScreen()
+        elif maximize:
+            self.showMaximized()
+        else:
+            self.show()
+
+    def _make_browser(self, url: str) -> QWebEngineView:
+        browser = self.app._make_browser_()
+        browser.setUrl(self.app.get_url(url))
+        browser.urlChanged.connect(lambda _: self._set_urlbar())
+        return browser
+
+    def _set_urlbar(self):
+        if (browser := self.browser()) is not None:
+            self.wg_url.setText(browser.url().toString())
+
+    def load(self, url: str):
+        self.browser().setUrl(self.app.get_url(url))
+
+    def closeEvent(self, event):
+        self.app.windows.pop(self.id, None)
+        QMainWindow.closeEvent(self, event)
+
+    def info(self) -> dict:
+        central = self.centralWidget()
+        if isinstance(central, QTabWidget):
+            urls = [central.widget(i).url().toString() for i in range(central.count())]
+        else:
+            urls = [central.url().toString()]
+        return dict(id=self.id, title=self.windowTitle(), screen=QApplication.screens().index(self.screen()), urls=urls)
+
+
+def make_profile(
+        parent: QObject,
+        profile_dir: str = None,
+        http_cache_dir: str = None,
+        http_cache_size: int = None,
+        http_cache_type: Literal["memory", "disk", "none"] = None,
+) -> QWebEngineProfile:
+    """
+    Get the profile shared by all browsers. Without parameterization, this is
+    the default profile (off the record). With `profile_dir` or
+    `http_cache_dir` it is a persistent profile with the name `showcase`,
+    otherwise an off the record profile with the cache settings (where a disk
+    cache falls back to memory).
+    """
+    if not (profile_dir or http_cache_dir or http_cache_size or http_cache_type):
+        return QWebEngineProfile.defaultProfile()
+    if profile_dir or http_cache_dir:
+        profile = QWebEngineProfile("showcase", parent)
+    else:
+        profile = QWebEngineProfile(parent)
+    if profile_dir:
+        profile.setPersistentStoragePath(profile_dir)
+    if http_cache_dir:
+        profile.setCachePath(http_cache_dir)
+    if http_cache_size:
+        profile.setHttpCacheMaximumSize(http_cache_size)
+    if http_cache_type:
+        profile.setHttpCacheType({
+            "memory": QWebEngineProfile.HttpCacheType.MemoryHttpCache,
+            "disk": QWebEngineProfile.HttpCacheType.DiskHttpCache,
+            "none": QWebEngineProfile.HttpCacheType.NoCache,
+        }[http_cache_type])
+    return profile
+
+
 class Showcase(QApplication):
 
     central_widget: QTabWidget | QWebEngineView
     window: QMainWindow
+    profile: QWebEngineProfile
     _browser: Callable[[], QWebEngineView]
     _make_browser_: Callable[[], QWebEngineView]
     _tabs_dyn_label: Callable[[int], None]
     _tabs_default_url: str
     _tabs_default_label: str
     _tabs_keep_last: bool
+    _tabs_preload: int
+    _tabs_pool: _BrowserPool | None
+    tab_registry: tabregistry.TabRegistry | None
+    windows: dict[int, _Window]
 
     @property
     def browser(self):
@@ -87,20 +274,23 @@ class Showcase(QApplication):
     def _make_browser(
             self,
             behavior_linktarget: Literal["showcase", "browser"] = None,
-            behavior_javascript: bool = False,
-            behavior_no_scrollbars: bool = False,
-            behavior_scrollanimator: bool = False,
-            behavior_policies: dict[str, bool] = None,
     ):
+        with startup.span("make_browser"):
+            browser = self._build_browser(behavior_linktarget)
+        if self._trace is not None and startup.recording:
+            browser.loadFinished.connect(lambda ok: self._trace_loaded(browser, ok))
+        return browser
+
+    def _build_browser(self, behavior_linktarget: Literal["showcase", "browser"] = None):
         browser = QWebEngineView()
 
         if behavior_linktarget == "showcase":
-            page = _IsolatedPage(browser)
+            page = _IsolatedPage(self.profile, browser)
             browser.setPage(page)
 
         else:
 
-            page = _RejectPage(browser)
+            page = _RejectPage(self.profile, browser)
             browser.setPage(page)
 
             if behavior_linktarget == "browser":
@@ -110,27 +300,39 @@ class Showcase(QApplication):
 
                 _RejectPage.alt = alt
 
-        policies = dict()
-
-        if behavior_javascript:
+        self.telemetry.instrument(browser, self.tab_id, lambda ok, duration: self._load_finished(browser, ok, duration))
+        self._com_events(browser)
 
-            policies[QWebEngineSettings.WebAttribute.JavascriptEnabled.name] = True
-            policies[QWebEngineSettings.WebAttribute.JavascriptCanOpenWindows.name] = True
-            policies[QWebEngineSettings.WebAttribute.JavascriptCanAccessClipboard.name] = True
-            policies[QWebEngineSettings.WebAttribute.JavascriptCanPaste.name] = True
-            policies[QWebEngineSettings.WebAttribute.AllowWindowActivationFromJavaScript.name] = True
-
-        if behavior_no_scrollbars:
-
-            policies[QWebEngineSettings.WebAttribute.ShowScrollBars.name] = False
-
-        if behavior_scrollanimator:
-
-            policies[QWebEngineSettings.WebAttribute.ScrollAnimatorEnabled.name] = True
+        return browser
 
-        webpolicies.configure(browser, policies | (behavior_policies or {}))
+    def _trace_loaded(self, browser: QWebEngineView, ok: bool, attempt: int = 0):
+        """Mark the first load and the first paint (of any tab), then write the trace."""
+        if attempt == 0 and not startup.mark_once("first loadFinished", ok=ok):
+            return
 
-        return browser
+        def result(t):
+            if t is not None:
+                startup.mark_once("first paint", startup.from_wall(t / 1000))
+            elif attempt < startup.FIRST_PAINT_ATTEMPTS:
+                QTimer.singleShot(100, lambda: self._trace_loaded(browser, ok, attempt + 1))
+                return
+            startup.write(*self._trace)
+
+        browser.page().runJavaScript(startup.FIRST_PAINT_SCRIPT, QWebEngineScript.ScriptWorldId.ApplicationWorld, result)
+
+    def _load_finished(self, browser: QWebEngineView, ok: bool, duration: float | None):
+        """Called by the telemetry, which times the loads of all browsers."""
+        if self.tab_registry is not None and (info := self.tab_registry.of(browser)) is not None:
+            info.loads += 1
+            info.load_failures += not ok
+            info.load_duration = duration
+        self.com_publish("load_finished", browser, ok=ok, duration=duration)
+
+    def _com_events(self, browser: QWebEngineView):
+        browser.loadStarted.connect(lambda: self.com_publish("load_started", browser))
+        browser.loadProgress.connect(lambda progress: self.com_publish("load_progress", browser, progress=progress))
+        browser.urlChanged.connect(lambda *_: self.com_publish("url_changed", browser))
+        browser.titleChanged.connect(lambda title: self.com_publish("title_changed", browser, title=title))
 
     def __init__(
             self,
@@ -160,15 +362,77 @@ class Showcase(QApplication):
             window_title: str = "",
             window_icon: str = None,
             window_maxsize: bool = True,
-            com_address: tuple[str, int] = None,
+            com_address: tuple[str, int] | str = None,
             behavior_linktarget: Literal["showcase", "browser"] = None,
             behavior_javascript: bool = False,
             behavior_no_scrollbars: bool = False,
             behavior_scrollanimator: bool = False,
             behavior_policies: dict[str, bool] = None,
+            tabs_lazy: bool = False,
+            tabs_preload: int = 0,
+            tabs_freeze_after: float = None,
+            tabs_discard_after: float = None,
+            tabs_memory_budget: int = None,
+            profile_dir: str = None,
+            http_cache_dir: str = None,
+            http_cache_size: int = None,
+            http_cache_type: Literal["memory", "disk", "none"] = None,
+            tabs_pool_size: int = 0,
+            telemetry_size: int = 32,
+            telemetry_log: str = None,
+            blocklist_files: list[str] = None,
+            package_specs: list[str] = None,
+            window_screen: int = None,
+            windows: list[dict] = None,
+            trace_startup: str = None,
+            trace_startup_chrome: str = None,
     ):
-        QApplication.__init__(self, argv)
-
+        if package_specs:
+            packages.register()
+        with startup.span("QApplication"):
+            QApplication.__init__(self, argv)
+
+        self._trace = None
+        if trace_startup or trace_startup_chrome:
+            self._trace = (trace_startup, trace_startup_chrome)
+            self.aboutToQuit.connect(lambda: startup.write(*self._trace))
+
+        self.com = None
+        # bound before the window is built, so that a concurrent start with
+        # `--single-instance' fails early and hands its urls over (requests
+        # are executed when the event loop runs)
+        if com_address:
+            self.com_i_pipe = Queue()
+            self.com_o_pipe = Queue()
+            self.com = communicate.ServerSide(self.com_i_pipe, self.com_o_pipe, com_address)
+            self.com_thread = QThread()
+            self.com.moveToThread(self.com_thread)
+            self.com_thread.started.connect(self.com.run)
+            self.com_thread.start()
+            self.com.pipesig.connect(self.com_exec)
+            self.com_commands = {name: getattr(self, name) for name in communicate.COMMANDS}
+            self.aboutToQuit.connect(lambda: self.com.close())
+
+        self.tab_registry = None
+        self.windows = dict()
+        self._window_ids = count(1)
+        self.telemetry = telemetry.Telemetry(telemetry_size or 32, telemetry_log)
+        self.aboutToQuit.connect(self.telemetry.close)
+        self.profile = make_profile(self, profile_dir, http_cache_dir, http_cache_size, http_cache_type)
+        self.blocklist = blocklist.Blocklist()
+        if blocklist_files:
+            for path in blocklist_files:
+                self.blocklist.load(path)
+            self.blocklist_interceptor = blocklist.BlocklistInterceptor(self.blocklist, self.profile)
+            self.profile.setUrlRequestInterceptor(self.blocklist_interceptor)
+        if package_specs:
+            self.packages = {name: packages.Package(path) for name, path in map(packages.parse_package, package_specs)}
+            self.packages_handler = packages.PackageSchemeHandler(self.packages, self.profile)
+            self.profile.installUrlSchemeHandler(packages.SCHEME, self.packages_handler)
+        webpolicies.apply(
+            self.profile.settings(),
+            webpolicies.resolve(behavior_javascript, behavior_no_scrollbars, behavior_scrollanimator, behavior_policies),
+        )
         self.window = QMainWindow()
 
         if window_icon:
@@ -176,7 +440,7 @@ class Showcase(QApplication):
         self.setApplicationName(window_title or "ShowCase")
         self.window.setWindowTitle(window_title or "ShowCase")
 
-        self._make_browser_ = lambda: self._make_browser(behavior_linktarget, behavior_javascript, behavior_no_scrollbars, behavior_scrollanimator, behavior_policies)
+        self._make_browser_ = lambda: self._make_browser(behavior_linktarget)
 
         self.home_url = home_url
 
@@ -208,8 +472,15 @@ class Showcase(QApplication):
             self._tabs_default_url = tabs_default_url or ""
             self._tabs_default_label = tabs_default_label or ""
             self._tabs_keep_last = tabs_keep_last
+            self._tabs_preload = tabs_preload or 0
+            self._tabs_pool = None
+            self.tab_registry = tabregistry.TabRegistry()
+            self._tab_current = None
 
+            # materialize a lazy tab before the other handlers access the browser
+            self.central_widget.currentChanged.connect(self._tab_activated)
             self.central_widget.currentChanged.connect(self.set_urlbar_from_browser)
+            self.central_widget.currentChanged.connect(lambda i: self.com_publish("tab_changed", self.central_widget.widget(i)))
             self.central_widget.tabCloseRequested.connect(self.tab_close)
 
             self._browser = lambda: self.central_widget.currentWidget()
@@ -221,10 +492,24 @@ class Showcase(QApplication):
 
             if isinstance(url, list):
                 for u in url:
-                    self.tab_add(u)
+                    self.tab_add(u, lazy=tabs_lazy)
+                if tabs_lazy and self._tabs_preload:
+                    QTimer.singleShot(0, lambda: self._tab_preload(self.central_widget.currentIndex()))
             elif url:
                 self.tab_add(url)
 
+            if tabs_pool_size:
+                self._tabs_pool = _BrowserPool(self._make_browser_, tabs_pool_size)
+
+            if tabs_freeze_after or tabs_discard_after or tabs_memory_budget:
+                self.tabs_hibernation = hibernation.Hibernation(
+                    self.central_widget,
+                    self.tab_registry,
+                    tabs_freeze_after or None,
+                    tabs_discard_after or None,
+                    tabs_memory_budget or None,
+                )
+
         else:
             self.central_widget = self._make_browser_()
             self.central_widget.urlChanged.connect(self.set_urlbar_from_browser)
@@ -287,23 +572,114 @@ class Showcase(QApplication):
 
         self.window.setCentralWidget(self.central_widget)
 
-        if window_maxsize:
-            self.window.showMaximized()
-        else:
-            self.window.show()
+        screens = self.screens()
+        if window_screen is not None and 0 <= window_screen < len(screens):
+            self.window.setScreen(screens[window_screen])
+            self.window.move(screens[window_screen].availableGeometry().topLeft())
 
-        if com_address:
-            self.com_i_pipe = Queue(1)
-            self.com_o_pipe = Queue(1)
-            self.com = communicate.ServerSide(self.com_i_pipe, self.com_o_pipe, com_address)
-            self.com_thread = QThread()
-            self.com.moveToThread(self.com_thread)
-            self.com_thread.started.connect(self.com.run)
-            self.com_thread.start()
-            self.com.pipesig.connect(self.com_exec)
+        with startup.span("window show"):
+            if window_maxsize:
+                self.window.showMaximized()
+            else:
+                self.window.show()
+
+        for window in windows or ():
+            self.window_open(**window)
 
     def com_exec(self):
-        data = self.com_i_pipe.get()
+        rid, kind, data, deadline = self.com_i_pipe.get()
+        if deadline is not None and monotonic() >= deadline:
+            # the timeout has already been answered by the communicator
+            return
+        if kind == communicate.FRAME_BATCH:
+            try:
+                operations, stop_on_error = pickle.loads(data)
+                operations = [(kind, data) for kind, data in operations]
+            except Exception as e:
+                self._com_reply(rid, [{"!": e}])
+                return
+            self._com_batch(rid, deadline, iter(operations), stop_on_error, list())
+        elif isinstance(res := self.com_exec_operation(kind, data, deadline), Future):
+            res.add_done_callback(lambda f: self._com_reply(rid, f.result()))
+        else:
+            self._com_reply(rid, res)
+
+    def _com_reply(self, rid: int, res: dict | list[dict]):
+        """Answer request `rid`, a response that cannot be pickled is answered with the error."""
+        try:
+            data = pickle.dumps(res)
+        except Exception as e:
+            error = {"!": RuntimeError(f"the response could not be pickled: {e!r}")}
+            data = pickle.dumps([error] if isinstance(res, list) else error)
+        self.com.reply(rid, data)
+
+    def _com_batch(self, rid: int, deadline: float | None, operations: Iterator[tuple[int, bytes]], stop_on_error: bool, results: list[dict]):
+        for kind, data in operations:
+            if deadline is not None and monotonic() >= deadline:
+                return
+            res = self.com_exec_operation(kind, data, deadline)
+            if isinstance(res, Future):
+
+                def resume(f: Future):
+                    results.append(r := f.result())
+                    if stop_on_error and "!" in r:
+                        self._com_reply(rid, results)
+                    else:
+                        self._com_batch(rid, deadline, operations, stop_on_error, results)
+
+                res.add_done_callback(resume)
+                return
+            results.append(res)
+            if stop_on_error and "!" in res:
+                break
+        self._com_reply(rid, results)
+
+    def com_exec_operation(self, kind: int, data: bytes, deadline: float = None) -> dict | Future:
+        if kind == communicate.FRAME_CALL:
+            return self.com_call(data, deadline)
+        else:
+            return self.com_exec_data(data)
+
+    def com_call(self, data: bytes, deadline: float = None) -> dict | Future:
+        """
+        Call a named command. Commands that return a ``Future`` are finished
+        asynchronously, the future of the response dict is returned then.
+        It is canceled when the `deadline` is reached.
+        """
+        res = dict()
+        name = "[??]"
+        try:
+            name, args, kwargs = pickle.loads(data)
+            if (command := self.com_commands.get(name)) is None:
+                raise NameError(f"unknown communicator command {name!r}")
+            ret = command(*args, **kwargs)
+            if isinstance(ret, Future):
+                return self._com_future(ret, name, deadline)
+            res["return"] = ret
+        except Exception as e:
+            print_exception(e)
+            stderr.flush()
+            print(f"\nThe above error occurred when calling the command {name}.\n", file=stderr, flush=True)
+            res["!"] = e
+        return res
+
+    def _com_future(self, future: Future, name: str, deadline: float | None) -> Future:
+        res = Future()
+
+        def done(f: Future):
+            try:
+                res.set_result({"return": f.result()})
+            except CancelledError:
+                res.set_result({"!": TimeoutError(f"the command {name} was canceled")})
+            except Exception as e:
+                res.set_result({"!": e})
+
+        future.add_done_callback(done)
+        if deadline is not None:
+            QTimer.singleShot(max(0, int((deadline - monotonic()) * 1000)), future.cancel)
+        return res
+
+    def com_exec_data(self, data: bytes) -> dict:
         res = dict()
         _exec = None
         msg = "[??]"
@@ -312,7 +688,7 @@ class Showcase(QApplication):
                 _exec = pickle.loads(data)
                 msg = f"{pickle} (protocol={communicate.PICKLE_PROTOCOL})"
             elif data.startswith(communicate.MARSHAL_HEADER):
-                _exec = FunctionType(marshal.loads(data), dict())
+                _exec = FunctionType(communicate.load_code(data), dict())
                 msg = f"{marshal} (version={communicate.MARSHAL_VERSION})"
         except Exception as e:
             print_exception(e)
@@ -325,13 +701,26 @@ class Showcase(QApplication):
                     _exec(self, res)
                 else:
                     _exec = data
-                    exec(data, dict(sc=self, showcase=self), res)
+                    exec(communicate.compile_source(data), dict(sc=self, showcase=self), res)
             except Exception as e:
                 print_exception(e)
                 stderr.flush()
                 print(f"\nThe above error occurred when executing {_exec}.\n", file=stderr, flush=True)
                 res["!"] = e
-        self.com_o_pipe.put(pickle.dumps(res))
+        return res
+
+    def com_publish(self, event: str, browser: QWebEngineView = None, **data):
+        """Send an event to the subscribers of the communicator (see ``communicate.EVENTS``)."""
+        if self.com is not None and self.com.subscribers:
+            event = dict(event=event, time=time(), **data)
+            if browser is not None:
+                event.update(
+                    tab=self.tab_index(browser),
+                    tab_id=self.tab_id(browser),
+                    window=self.window_id(browser),
+                    url=browser.url().toString(),
+                )
+            self.com.publish(event)
 
     def back(self):
         self.browser.back()
@@ -363,35 +752,291 @@ class Showcase(QApplication):
     def set_urlbar_from_browser(self):
         self.wg_url.setText(self.browser.url().toString())
 
-    def tab_set_label(self, label: str, index: int = None):
+    def tab_index(self, browser: QWebEngineView) -> int | None:
+        """The position of `browser` in the tabs of the main window, None if it is not a tab there."""
+        if isinstance(self.central_widget, QTabWidget) and (index := self.central_widget.indexOf(browser)) >= 0:
+            return index
+
+    def window_id(self, browser: QWebEngineView) -> int | None:
+        """The id of the additional window of `browser`, None for the main window."""
+        if isinstance(window := browser.window(), _Window):
+            return window.id
+
+    def tab_id(self, browser: QWebEngineView) -> int | None:
+        if self.tab_registry is not None and (info := self.tab_registry.of(browser)) is not None:
+            return info.id
+
+    def _tab_index(self, index: int = None, tab_id: int = None) -> int:
+        """The position of the tab with `tab_id`, or `index`, or of the current tab."""
+        if tab_id is not None:
+            return self.central_widget.indexOf(self.tab_registry[tab_id].widget)
         if index is None:
-            index = self.central_widget.currentIndex()
-        self.central_widget.setTabText(index, label)
+            return self.central_widget.currentIndex()
+        return index
+
+    def tab_browser(self, index: int = None, tab_id: int = None) -> QWebEngineView:
+        if index is None and tab_id is None:
+            return self.browser
+        return self.tab_materialize(self._tab_index(index, tab_id))
+
+    def tab_list(self) -> list[dict]:
+        """The metadata of all tabs in the order of their positions."""
+        return [self.tab_info(i) for i in range(self.central_widget.count())]
+
+    def tab_info(self, index: int = None, tab_id: int = None) -> dict:
+        index = self._tab_index(index, tab_id)
+        info = self.tab_registry.of(self.central_widget.widget(index))
+        return info.as_dict() | dict(index=index, label=self.central_widget.tabText(index))
+
+    @staticmethod
+    def _connect_until(future: Future, *connections: tuple[pyqtBoundSignal, Callable]):
+        """Connect the slots to the signals until `future` is done (the senders may be deleted by then)."""
+        for signal, slot in connections:
+            signal.connect(slot)
+
+        def disconnect(_):
+            for signal, slot in connections:
+                try:
+                    signal.disconnect(slot)
+                except (RuntimeError, TypeError):
+                    pass
+
+        future.add_done_callback(disconnect)
+
+    def wait_load(self, index: int = None, tab_id: int = None) -> bool | Future:
+        """
+        Wait until the page of tab `index` or `tab_id` (default: current) is
+        loaded, returns whether successful (False if the tab is closed meanwhile).
+        """
+        browser = self.tab_browser(index, tab_id)
+        if not browser.page().isLoading():
+            return True
+        future = Future()
+
+        def finished(ok: bool):
+            if not future.done():
+                future.set_result(ok)
+
+        self._connect_until(
+            future,
+            (browser.loadFinished, finished),
+            (browser.destroyed, lambda *_: finished(False)),
+        )
+        return future
+
+    def evaluate(self, script: str, index: int = None, tab_id: int = None) -> Future:
+        """
+        Run JavaScript in the page of tab `index` or `tab_id` (default: current),
+        returns the result. Fails if the tab is closed or the page is frozen or
+        discarded before the result is available.
+        """
+        browser = self.tab_browser(index, tab_id)
+        page = browser.page()
+        if (state := page.lifecycleState()) != QWebEnginePage.LifecycleState.Active:
+            raise RuntimeError(f"the page is {state.name.lower()}")
+        future = Future()
+
+        def result(value):
+            if not future.done():
+                future.set_result(value)
+
+        def fail(reason: str):
+            if not future.done():
+                future.set_exception(RuntimeError(reason))
+
+        def lifecycle(state: QWebEnginePage.LifecycleState):
+            if state != QWebEnginePage.LifecycleState.Active:
+                fail(f"the page was {state.name.lower()}")
+
+        self._connect_until(
+            future,
+            (browser.destroyed, lambda *_: fail("the tab was closed")),
+            (page.lifecycleStateChanged, lifecycle),
+        )
+        page.runJavaScript(script, result)
+        return future
+
+    def tab_set_label(self, label: str, index: int = None, tab_id: int = None):
+        self.central_widget.setTabText(self._tab_index(index, tab_id), label)
 
     def tab_set_label_from_browser(self, index: int = None):
         if index is None:
             index = self.central_widget.currentIndex()
         self.tab_set_label(self.central_widget.widget(index).page().title(), index)
 
-    def tab_add(self, url: str = None):
-        url = url or self._tabs_default_url
-        browser = self._make_browser_()
+    def _tab_browser(self, url: str) -> QWebEngineView:
+        if self._tabs_pool is not None:
+            browser = self._tabs_pool.take()
+        else:
+            browser = self._make_browser_()
         browser.setUrl(self.get_url(url))
-        i = self.central_widget.addTab(browser, self._tabs_default_label)
         browser.urlChanged.connect(self.set_urlbar_from_browser)
-        browser.loadFinished.connect(lambda *_, _i=i: self._tabs_dyn_label(_i))
-        self.central_widget.setCurrentIndex(i)
+        # the position of the tab changes when a tab before it is closed
+        browser.loadFinished.connect(lambda *_: self._tabs_dyn_label(self.central_widget.indexOf(browser)))
+
+        def url_changed(url: QUrl):
+            if (info := self.tab_registry.of(browser)) is not None:
+                info.url = url.toString()
+
+        browser.urlChanged.connect(url_changed)
+        return browser
 
-    def tab_close(self, index: int = None):
+    def tab_add(self, url: str = None, lazy: bool = False) -> int:
+        """
+        Add a tab with `url` and focus it, returns the id of the tab. A `lazy`
+        tab only holds the url and label and is not focused, the browser is
+        created at the first activation.
+        """
+        url = url or self._tabs_default_url
+        # the first tab is focused on insertion anyway
+        if lazy and self.central_widget.count():
+            widget = _TabPlaceholder(url)
+            info = self.tab_registry.add(widget, url)
+            self.central_widget.addTab(widget, self._tabs_default_label or url)
+        else:
+            i = self.central_widget.count()
+            widget = self._tab_browser(url)
+            info = self.tab_registry.add(widget, url)
+            self.central_widget.addTab(widget, self._tabs_default_label)
+            self.central_widget.setCurrentIndex(i)
+        return info.id
+
+    def tab_materialize(self, index: int) -> QWebEngineView:
+        """Replace the placeholder of a lazy tab by its browser."""
+        placeholder = self.central_widget.widget(index)
+        if not isinstance(placeholder, _TabPlaceholder):
+            return placeholder
+        browser = self._tab_browser(placeholder.url)
+        self.tab_registry.replace(placeholder, browser)
+        current = self.central_widget.currentIndex()
+        label = self.central_widget.tabText(index)
+        self.central_widget.blockSignals(True)
+        try:
+            self.central_widget.removeTab(index)
+            self.central_widget.insertTab(index, browser, label)
+            self.central_widget.setCurrentIndex(current)
+        finally:
+            self.central_widget.blockSignals(False)
+        placeholder.deleteLater()
+        return browser
+
+    def _tab_activated(self, index: int):
+        if isinstance(self.central_widget.widget(index), _TabPlaceholder):
+            self.tab_materialize(index)
+            if self._tabs_preload:
+                QTimer.singleShot(0, lambda: self._tab_preload(index))
+        # the tab that is left and the focused tab were active until now
+        now = time()
+        for widget in (self._tab_current, self.central_widget.widget(index)):
+            if (info := self.tab_registry.of(widget)) is not None:
+                info.last_active = now
+        self._tab_current = self.central_widget.widget(index)
+
+    def _tab_preload(self, index: int):
+        for i in range(index + 1, min(index + 1 + self._tabs_preload, self.central_widget.count())):
+            self.tab_materialize(i)
+
+    def tab_close(self, index: int = None, tab_id: int = None):
         if self.central_widget.count() == 1 and self._tabs_keep_last:
             return
-        if index is None:
-            index = self.central_widget.currentIndex()
+        index = self._tab_index(index, tab_id)
+        widget = self.central_widget.widget(index)
         self.central_widget.removeTab(index)
+        self.tab_registry.remove(widget)
+        # release the page and its renderer
+        widget.deleteLater()
         self.set_urlbar_from_browser()
 
-    def tab_change(self, index: int):
-        self.central_widget.setCurrentIndex(index)
+    def tab_change(self, index: int = None, tab_id: int = None):
+        self.central_widget.setCurrentIndex(self._tab_index(index, tab_id))
+
+    def tab_load(self, url: str, index: int = None, tab_id: int = None):
+        self.tab_change(index, tab_id)
+        self.load(url)
+
+    def ping(self):
+        return 1
+
+    def handoff(self, urls: list[str]):
+        """Open the urls of another invocation (see ``--single-instance``) and raise the window."""
+        if isinstance(self.central_widget, QTabWidget):
+            for url in urls:
+                self.tab_add(url)
+        elif urls:
+            self.load(urls[0])
+        self.window.setWindowState(self.window.windowState() & ~Qt.WindowState.WindowMinimized | Qt.WindowState.WindowActive)
+        self.window.raise_()
+        self.window.activateWindow()
+
+    def window_open(
+            self,
+            url: str | list[str] = None,
+            screen: int = None,
+            toolbar: tuple[str, ...] = (),
+            title: str = None,
+            maximize: bool = True,
+            fullscreen: bool = False,
+    ) -> int:
+        """
+        Open an additional window with `url` (tabs if a list is given) on the
+        screen with index `screen`, returns the id of the window. `toolbar` names
+        the elements of the toolbar (see ``_Window.TOOLBAR``).
+        """
+        urls = [url] if isinstance(url, str) else list(url or ())
+        for name in toolbar:
+            if name not in _Window.TOOLBAR:
+                raise ValueError(f"unknown toolbar element: {name!r}")
+        window_id = next(self._window_ids)
+        self.windows[window_id] = _Window(self, window_id, urls, tuple(toolbar), title, screen, maximize, fullscreen)
+        return window_id
+
+    def window_close(self, window_id: int):
+        self.windows[window_id].close()
+
+    def window_list(self) -> list[dict]:
+        """The additional windows (id, title, screen index, urls)."""
+        return [window.info() for window in self.windows.values()]
+
+    def blocklist_hits(self) -> dict[str, int]:
+        """The hit counts of the blocklist rules, the most frequent first."""
+        return dict(self.blocklist.hits.most_common())
+
+    def _tab_widget(self, index: int = None, tab_id: int = None) -> QWebEngineView | _TabPlaceholder:
+        """Like ``tab_browser``, but the placeholder of a lazy tab is not materialized."""
+        if index is None and tab_id is None:
+            return self.browser
+        if (widget := self.central_widget.widget(i := self._tab_index(index, tab_id))) is None:
+            raise IndexError(f"no tab at index {i}")
+        return widget
+
+    def timings(self, index: int = None, tab_id: int = None) -> list[dict]:
+        """The load timings of tab `index` or `tab_id` (default: current), the oldest first."""
+        if isinstance(widget := self._tab_widget(index, tab_id), _TabPlaceholder):
+            return []
+        return self.telemetry.get(widget)
+
+    def policies(self, index: int = None, tab_id: int = None) -> dict[str, bool]:
+        """
+        The policies of the profile (all attributes, resolved from the behavior options),
+        or the effective policies of tab `index` or `tab_id` if given.
+        """
+        if index is None and tab_id is None:
+            return webpolicies.get_current(self.profile)
+        if isinstance(widget := self._tab_widget(index, tab_id), _TabPlaceholder):
+            # a lazy tab gets the policies of the profile when it is materialized
+            return webpolicies.get_current(self.profile)
+        return webpolicies.get_current(widget)
+
+    def policy_set(self, name: str, value: bool, index: int = None, tab_id: int = None):
+        """
+        Change the policy `name` for all browsers, or only for tab `index` or `tab_id` if given.
+
+        A tab keeps its own value only where it differs from the profile.
+        """
+        if index is None and tab_id is None:
+            webpolicies.apply(self.profile.settings(), {name: value})
+        else:
+            webpolicies.override(self.tab_browser(index, tab_id).settings(), self.profile.settings(), name, value)
 
 
 if __name__ == "__main__":
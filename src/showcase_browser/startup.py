@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from time import perf_counter, time
+from typing import Iterator
+
+# Timestamps of the startup phases (see `--trace-startup'). Phases are
+# recorded until the startup is over (``stop``), this is cheap; they are only
+# written if requested. The timeline starts when this module is imported,
+# which is the first thing `main' does.
+
+T0 = perf_counter()
+WALL0 = time()
+
+# epoch time (ms) of the first (contentful) paint of the page, or null before it
+FIRST_PAINT_SCRIPT = """
+(() => {
+    const paints = performance.getEntriesByType("paint");
+    const paint = paints.find(e => e.name === "first-contentful-paint") || paints.find(e => e.name === "first-paint");
+    return paint ? performance.timeOrigin + paint.startTime : null;
+})()
+"""
+# the first paint is polled every 100 ms until it is available
+FIRST_PAINT_ATTEMPTS = 50
+
+# (name, start, end or None for an instant, thread id, args)
+events: list[tuple[str, float, float | None, int, dict]] = list()
+_once: set[str] = set()
+_written = False
+recording = True
+
+
+def now() -> float:
+    """Seconds since the start of the timeline."""
+    return perf_counter() - T0
+
+
+def stop():
+    """End the recording, phases of the running application are not recorded."""
+    global recording
+    recording = False
+
+
+@contextmanager
+def span(name: str, **args) -> Iterator[None]:
+    start = now()
+    try:
+        yield
+    finally:
+        if recording:
+            events.append((name, start, now(), threading.get_ident(), args))
+
+
+def mark(name: str, at: float = None, **args):
+    """Record the instant `name` (at `at` seconds on the timeline, default: now)."""
+    if recording:
+        events.append((name, now() if at is None else at, None, threading.get_ident(), args))
+
+
+def mark_once(name: str, at: float = None, **args) -> bool:
+    if name in _once:
+        return False
+    _once.add(name)
+    mark(name, at, **args)
+    return True
+
+
+def from_wall(t: float) -> float:
+    """Convert the epoch time `t` into seconds on the timeline."""
+    return t - WALL0
+
+
+def report() -> dict:
+    phases = list()
+    marks = list()
+    for name, start, end, tid, args in sorted(events, key=lambda e: e[1]):
+        if end is None:
+            marks.append(dict(name=name, at=start * 1000, thread=tid, **args))
+        else:
+            phases.append(dict(name=name, start=start * 1000, end=end * 1000, duration=(end - start) * 1000, thread=tid, **args))
+    return dict(unit="ms", time=WALL0, pid=os.getpid(), phases=phases, marks=marks)
+
+
+def chrome_trace() -> dict:
+    """The events in the Chrome trace event format (chrome://tracing, Perfetto)."""
+    pid = os.getpid()
+    trace = list()
+    for name, start, end, tid, args in events:
+        if end is None:
+            trace.append(dict(name=name, ph="i", s="p", ts=start * 1e6, pid=pid, tid=tid, args=args))
+        else:
+            trace.append(dict(name=name, ph="X", ts=start * 1e6, dur=(end - start) * 1e6, pid=pid, tid=tid, args=args))
+    return dict(traceEvents=trace, displayTimeUnit="ms")
+
+
+def write(path: str | None, chrome_path: str | None = None):
+    """Write the report to `path` and the Chrome trace to `chrome_path` (once)."""
+    global _written
+    if _written:
+        return
+    _written = True
+    stop()
+    if path:
+        with open(path, "w") as f:
+            json.dump(report(), f, indent=2)
+    if chrome_path:
+        with open(chrome_path, "w") as f:
+            json.dump(chrome_trace(), f)
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from itertools import count
+from time import time
+
+from PyQt6.QtWidgets import QWidget
+
+
+class TabInfo:
+    """Metadata of a tab, which is addressed by its stable ``id``."""
+
+    __slots__ = ("id", "widget", "url", "created", "last_active", "loads", "load_failures", "load_duration")
+
+    def __init__(self, tab_id: int, widget: QWidget, url: str | None):
+        self.id = tab_id
+        self.widget = widget
+        self.url = url
+        self.created = time()
+        # when the tab was last focused or left (None if it was never focused)
+        self.last_active: float | None = None
+        self.loads = 0
+        self.load_failures = 0
+        # duration of the last finished load in seconds
+        self.load_duration: float | None = None
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__ if name != "widget"}
+
+
+class TabRegistry:
+    """
+    Maps the stable ids of the tabs to their ``TabInfo`` and the widgets back to
+    the ids. Ids are never reused, unlike the positions of the tabs.
+    """
+
+    def __init__(self):
+        self.tabs: dict[int, TabInfo] = dict()
+        self._ids: dict[QWidget, int] = dict()
+        self._next_id = count(1)
+
+    def __len__(self):
+        return len(self.tabs)
+
+    def __getitem__(self, tab_id: int) -> TabInfo:
+        try:
+            return self.tabs[tab_id]
+        except KeyError:
+            raise KeyError(f"no tab with id {tab_id}") from None
+
+    def add(self, widget: QWidget, url: str | None) -> TabInfo:
+        info = TabInfo(next(self._next_id), widget, url)
+        self.tabs[info.id] = info
+        self._ids[widget] = info.id
+        return info
+
+    def replace(self, old: QWidget, new: QWidget) -> TabInfo:
+        """Assign the tab of widget `old` to widget `new`."""
+        info = self.tabs[self._ids.pop(old)]
+        info.widget = new
+        self._ids[new] = info.id
+        return info
+
+    def remove(self, widget: QWidget) -> TabInfo | None:
+        if (tab_id := self._ids.pop(widget, None)) is not None:
+            return self.tabs.pop(tab_id)
+
+    def of(self, widget: QWidget) -> TabInfo | None:
+        if (tab_id := self._ids.get(widget)) is not None:
+            return self.tabs[tab_id]
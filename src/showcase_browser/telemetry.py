@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import json
+from collections import deque
+from time import monotonic, time
+from typing import Callable, TextIO
+from weakref import WeakKeyDictionary
+
+from PyQt6.QtWebEngineCore import QWebEngineScript
+from PyQt6.QtWebEngineWidgets import QWebEngineView
+
+
+# collects the Navigation Timing and Paint Timing entries of the page
+TIMING_SCRIPT = """\
+(function () {
+    var nav = performance.getEntriesByType("navigation")[0];
+    var paint = {};
+    performance.getEntriesByType("paint").forEach(function (e) { paint[e.name] = e.startTime; });
+    return JSON.stringify({navigation: nav ? nav.toJSON() : null, paint: paint});
+})()
+"""
+
+
+class Telemetry:
+    """
+    Times the loads of browsers (``loadStarted`` -> first ``loadProgress`` ->
+    ``loadFinished``) and collects the Navigation Timing and Paint Timing
+    entries of the page afterwards.
+
+    The last `size` records of each browser are kept. If `log` is given,
+    each record is also appended as a JSON line to this file.
+    """
+
+    def __init__(self, size: int = 32, log: str = None):
+        self.size = size
+        self.records: WeakKeyDictionary[QWebEngineView, deque[dict]] = WeakKeyDictionary()
+        self.log: TextIO | None = open(log, "a", buffering=1) if log else None
+
+    def close(self):
+        if self.log is not None:
+            self.log.close()
+            self.log = None
+
+    def instrument(
+            self,
+            browser: QWebEngineView,
+            tab_id: Callable[[QWebEngineView], int | None] = None,
+            finished: Callable[[bool, float | None], None] = None,
+    ):
+        """
+        Record the loads of `browser`, `tab_id` gets the id of its tab for the
+        records. `finished` is called with ``ok`` and the duration of each load.
+        """
+        records = self.records[browser] = deque(maxlen=self.size)
+        started = monotonic()
+        record = dict()
+
+        def load_started():
+            nonlocal started, record
+            started = monotonic()
+            record = dict(started=time(), url=browser.url().toString(), first_progress=None)
+
+        def load_progress(progress: int):
+            if progress and record.get("first_progress", 0) is None:
+                record["first_progress"] = monotonic() - started
+
+        def load_finished(ok: bool):
+            nonlocal record
+            done, record = record, dict()
+            if not done:
+                if finished is not None:
+                    finished(ok, None)
+                return
+            done.update(
+                url=browser.url().toString(),
+                tab_id=tab_id(browser) if tab_id else None,
+                ok=ok,
+                duration=monotonic() - started,
+                navigation=None,
+                paint=None,
+            )
+            records.append(done)
+            if finished is not None:
+                finished(ok, done["duration"])
+            if ok:
+                browser.page().runJavaScript(
+                    TIMING_SCRIPT,
+                    QWebEngineScript.ScriptWorldId.ApplicationWorld,
+                    lambda result: self._timing(done, result),
+                )
+            else:
+                self._write(done)
+
+        browser.loadStarted.connect(load_started)
+        browser.loadProgress.connect(load_progress)
+        browser.loadFinished.connect(load_finished)
+
+    def _timing(self, record: dict, result):
+        try:
+            record.update(json.loads(result))
+        except (TypeError, ValueError):
+            pass
+        self._write(record)
+
+    def _write(self, record: dict):
+        if self.log is not None:
+            self.log.write(json.dumps(record) + "\n")
+
+    def get(self, browser: QWebEngineView) -> list[dict]:
+        """The records of `browser`, the oldest first."""
+        return list(self.records.get(browser, ()))
@@ -1,7 +1,13 @@
 from showcase_browser import __version__
+import startup
+from os import environ
+from pathlib import Path
+from queue import Queue, Empty
+from threading import Thread
+from time import monotonic, time
 from urllib.request import urlopen
 from urllib.error import HTTPError, URLError
-from json import loads
+from json import dumps, loads
 from json.decoder import JSONDecodeError
 
 from PyQt6.QtCore import PYQT_VERSION_STR, QT_VERSION_STR
@@ -28,13 +34,50 @@ Your environ provides
 """
 
 
-class available:
+# the json api of the package index (a local stand-in can be set for tests)
+INDEX_URL = environ.get("SHOWCASE_INDEX_URL", "https://pypi.org/pypi")
+# the available versions are cached in this file for CACHE_TTL seconds
+CACHE_FILE = Path(environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "showcase" / "versions.json"
+CACHE_TTL = 24 * 60 * 60
+# lookups that missed the deadline are retried after this time
+CACHE_TTL_PARTIAL = 10 * 60
+# time limit in seconds for all lookups
+DEADLINE = 3.0
+
+PACKAGES = {
+    "ShowCase": "showcase-browser",
+    "PyQt6": "PyQt6",
+    "PyQt6WebEngine": "PyQt6-WebEngine",
+}
+
+
+class Available:
+
+    def __init__(
+            self,
+            index_url: str = INDEX_URL,
+            cache_file: Path = CACHE_FILE,
+            ttl: float = CACHE_TTL,
+            deadline: float = DEADLINE,
+            ttl_partial: float = CACHE_TTL_PARTIAL,
+    ):
+        self.index_url = index_url
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self.ttl_partial = ttl_partial
+        self.deadline = deadline
+        self.ShowCase = self.PyQt6 = self.PyQt6WebEngine = None
 
-    def __init__(self):
         def get():
-            self.ShowCase = self.get_available("showcase-browser")
-            self.PyQt6 = self.get_available("PyQt6")
-            self.PyQt6WebEngine = self.get_available("PyQt6-WebEngine")
+            versions = self.load_cache()
+            if versions is None:
+                # unsuccessful lookups are cached as well, so that offline starts do not retry each time,
+                # lookups that missed the deadline only for `ttl_partial`
+                found = self.get_all()
+                versions = {attr: found.get(attr) for attr in PACKAGES}
+                self.store_cache(versions, len(found) == len(PACKAGES))
+            for attr, version in versions.items():
+                setattr(self, attr, version)
 
         self.get = get
 
@@ -43,10 +86,55 @@ class available:
         self.get = lambda: None
         return self
 
+    def load_cache(self) -> dict[str, str | None] | None:
+        try:
+            with open(self.cache_file) as f:
+                cache = loads(f.read())
+            ttl = self.ttl if cache.get("complete", True) else self.ttl_partial
+            if cache["index"] == self.index_url and 0 <= time() - cache["time"] < ttl:
+                return {attr: cache["versions"].get(attr) for attr in PACKAGES}
+        except (OSError, JSONDecodeError, KeyError, TypeError, AttributeError):
+            pass
+        return None
+
+    def store_cache(self, versions: dict[str, str | None], complete: bool = True):
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_file.with_suffix(".tmp")
+            with open(tmp, "w") as f:
+                f.write(dumps(dict(index=self.index_url, time=time(), complete=complete, versions=versions)))
+            tmp.replace(self.cache_file)
+        except OSError:
+            pass
+
+    def get_all(self) -> dict[str, str | None]:
+        """
+        Look up the packages concurrently, lookups that miss the deadline are
+        missing in the result. They are left to daemon threads, which do not
+        delay the exit (e.g. while a name resolution hangs).
+        """
+        results: Queue[tuple[str, str | None]] = Queue()
+        for attr, package in PACKAGES.items():
+            Thread(
+                target=lambda attr=attr, package=package: results.put(
+                    (attr, self.get_available(package, None, self.index_url, self.deadline))),
+                name=f"showcase-upgrades-{package}",
+                daemon=True,
+            ).start()
+        versions = dict()
+        end = monotonic() + self.deadline
+        while len(versions) < len(PACKAGES) and (left := end - monotonic()) > 0:
+            try:
+                attr, version = results.get(timeout=left)
+            except Empty:
+                break
+            versions[attr] = version
+        return versions
+
     @staticmethod
-    def get_available(package, default=None):
+    def get_available(package, default=None, index_url=INDEX_URL, timeout=DEADLINE):
         try:
-            with urlopen(f"https://pypi.python.org/pypi/{package}/json") as u:
+            with urlopen(f"{index_url}/{package}/json", timeout=timeout) as u:
                 return loads(u.read())["info"]["version"]
         except (URLError, HTTPError):
             pass
@@ -61,7 +149,7 @@ class available:
         return default
 
 
-available = available()
+available = Available()
 
 
 def get_available_msg():
@@ -103,3 +191,17 @@ A new version of `PyQt6-WebEngine' is available ({a.PyQt6WebEngine}), for an upg
 [*]
 \x1b[m
 """
+
+
+def check_background() -> Thread:
+    """Print the message of ``check_msg`` (if any) from a background thread."""
+
+    def check():
+        with startup.span("upgrade check"):
+            msg = check_msg()
+        if msg:
+            print(msg, flush=True)
+
+    thread = Thread(target=check, name="showcase-upgrades", daemon=True)
+    thread.start()
+    return thread
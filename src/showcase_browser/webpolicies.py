@@ -1,4 +1,4 @@
-from PyQt6.QtWebEngineCore import QWebEngineSettings
+from PyQt6.QtWebEngineCore import QWebEngineProfile, QWebEngineSettings
 from PyQt6.QtWebEngineWidgets import QWebEngineView
 from PyQt6.QtWidgets import QApplication
 
@@ -9,18 +9,50 @@ from PyQt6.QtWidgets import QApplication
 MAP = QWebEngineSettings.WebAttribute._member_map_
 
 
-def get_current(browser: QWebEngineView) -> dict[str, bool]:
+def get_current(browser: QWebEngineView | QWebEngineProfile) -> dict[str, bool]:
     settings = browser.settings()
     return {name: settings.testAttribute(val)
             for name, val in MAP.items()}
 
 
-def configure(browser: QWebEngineView, __map: dict[str, bool]):
-    settings = browser.settings()
+def resolve(
+        javascript: bool = False,
+        no_scrollbars: bool = False,
+        scrollanimator: bool = False,
+        policies: dict[str, bool] = None,
+) -> dict[str, bool]:
+    """The policies of the behavior flags, overridden by the explicit `policies`."""
+    resolved = dict()
+    if javascript:
+        resolved[QWebEngineSettings.WebAttribute.JavascriptEnabled.name] = True
+        resolved[QWebEngineSettings.WebAttribute.JavascriptCanOpenWindows.name] = True
+        resolved[QWebEngineSettings.WebAttribute.JavascriptCanAccessClipboard.name] = True
+        resolved[QWebEngineSettings.WebAttribute.JavascriptCanPaste.name] = True
+        resolved[QWebEngineSettings.WebAttribute.AllowWindowActivationFromJavaScript.name] = True
+    if no_scrollbars:
+        resolved[QWebEngineSettings.WebAttribute.ShowScrollBars.name] = False
+    if scrollanimator:
+        resolved[QWebEngineSettings.WebAttribute.ScrollAnimatorEnabled.name] = True
+    return resolved | (policies or {})
+
+
+def apply(settings: QWebEngineSettings, __map: dict[str, bool]):
     for name, val in __map.items():
         settings.setAttribute(MAP[name], val)
 
 
+def override(settings: QWebEngineSettings, defaults: QWebEngineSettings, name: str, val: bool):
+    """
+    Set the attribute `name` in `settings` only where it differs from
+    `defaults` (the profile settings), otherwise `settings` follow `defaults`.
+    """
+    attr = MAP[name]
+    if defaults.testAttribute(attr) == val:
+        settings.resetAttribute(attr)
+    else:
+        settings.setAttribute(attr, val)
+
+
 def about():
     app = QApplication(["webpolicies"])
     defaults = get_current(QWebEngineView())